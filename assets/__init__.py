@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 
 CURDIR = Path(__file__).parent
@@ -5,7 +6,9 @@ DATA_DIR = CURDIR / "data"
 
 # Data sets path
 DATA_18W01 = DATA_DIR / "18w01_Looks_vs_Personality.csv"
-DATA_18W02 = DATA_DIR / "18W02_Sample_Superstore.csv"
+DATA_18W02_SAMPLE = DATA_DIR / "18W02_Sample_Superstore.csv"
+# Another Superstore export, e.g. a large synthetic one (see assets.synthetic)
+DATA_18W02 = Path(os.environ.get("WOW_SUPERSTORE", DATA_18W02_SAMPLE))
 DATA_18W03 = DATA_18W02
 DATA_18W04 = DATA_18W02
 DATA_18W05 = DATA_18W02
@@ -25,5 +28,12 @@ DATA_18W18 = DATA_18W02
 DATA_18W19 = DATA_18W02
 DATA_MAP = DATA_DIR / "us_state_code.csv"
 
+# Shared data sets
+from assets.datasets import load, clear, depends_on, register  # noqa: E402
+from assets import basket, cohort, cube, fiscal, hierarchy, ingest  # noqa: E402
+
+# WOW_SUPERSTORE may name its export anything
+register(DATA_18W02, "superstore")
+
 if __name__ == "__main__":
     print(DATA_18W01)
@@ -0,0 +1,143 @@
+import numpy as np
+import pandas as pd
+
+# Line pairs expanded per pass: large data sets are folded chunk by chunk, so
+# only the distinct pairs (or the top pairs of every item) are held in full
+CHUNK_PAIRS = 4_000_000
+COMPACT_EVERY = 8
+
+
+def _codes(values: pd.Series) -> tuple[np.ndarray, pd.Index]:
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        return values.cat.codes.to_numpy(), values.cat.categories
+    codes, labels = pd.factorize(values)
+    return codes, pd.Index(labels)
+
+
+def _reduce(keys: np.ndarray, counts: np.ndarray, value1: np.ndarray, value2: np.ndarray):
+    keys, inverse = np.unique(keys, return_inverse=True)
+    return (
+        keys,
+        np.bincount(inverse, weights=counts).astype(np.int64),
+        np.bincount(inverse, weights=value1),
+        np.bincount(inverse, weights=value2),
+    )
+
+
+def _passes(fanout: np.ndarray) -> np.ndarray:
+    # Bounds of consecutive groups of about CHUNK_PAIRS line pairs each
+    passes = np.cumsum(fanout.astype(np.int64)) // CHUNK_PAIRS
+    return np.r_[0, np.flatnonzero(np.diff(passes)) + 1, len(fanout)]
+
+
+def _runs(values: np.ndarray) -> np.ndarray:
+    # Start of every run of equal values, plus the end of the last one
+    starts = np.flatnonzero(values[1:] != values[:-1]) + 1
+    return np.r_[0, starts, len(values)] if len(values) else np.zeros(1, dtype=np.int64)
+
+
+def _lines(frame: pd.DataFrame, basket: str, item: str, value: str):
+    baskets, _ = _codes(frame[basket])
+    items, labels = _codes(frame[item])
+    values = frame[value].to_numpy(dtype=float)
+
+    # Lines of the same basket next to each other, with the start and size of
+    # their basket alongside
+    order = np.argsort(baskets, kind="stable")
+    items, values = items[order], values[order]
+    bounds = _runs(baskets[order])
+    sizes = np.diff(bounds)
+    return items, values, np.repeat(bounds[:-1], sizes), np.repeat(sizes, sizes), labels
+
+
+def _expand(items, values, starts, sizes, lines: np.ndarray, n_items: int, diagonal: bool = True):
+    # Every one of `lines` is paired with every line of its basket
+    fanout = sizes[lines]
+    left = np.repeat(lines, fanout)
+    offset = np.arange(len(left)) - np.repeat(np.cumsum(fanout) - fanout, fanout)
+    right = np.repeat(starts[lines], fanout) + offset
+    if not diagonal:
+        keep = items[left] != items[right]
+        left, right = left[keep], right[keep]
+    keys = items[left].astype(np.int64) * n_items + items[right]
+    return _reduce(keys, np.ones(len(keys)), values[left], values[right])
+
+
+def _frame(keys, counts, value1, value2, labels: pd.Index) -> pd.DataFrame:
+    return pd.DataFrame({
+        "item1": pd.Categorical.from_codes(keys // len(labels), labels),
+        "item2": pd.Categorical.from_codes(keys % len(labels), labels),
+        "count": counts,
+        "value1": value1,
+        "value2": value2,
+    })
+
+
+def pairs(frame: pd.DataFrame, basket: str, item: str, value: str) -> pd.DataFrame:
+    """Items bought together: one row per ordered pair sharing a basket.
+
+    `frame` holds one row per basket and item, e.g. the order_subcategories
+    rollup. With A the basket x item incidence matrix and V the same matrix
+    holding `value`, the result is the non-zero part of A'A (`count`, the
+    number of shared baskets) and V'A (`value1` and `value2`, the total value
+    of each side over those baskets), diagonal included.
+
+    Only pairs that occur are built, so the cost grows with the number of
+    lines per basket rather than with the square of the number of items.
+    """
+    items, values, starts, sizes, labels = _lines(frame, basket, item, value)
+
+    # Whole baskets per pass, about CHUNK_PAIRS line pairs each
+    bounds = _runs(starts)
+    passes = bounds[_passes(sizes[bounds[:-1]] ** 2)]
+
+    partials = []
+    for lo, hi in zip(passes[:-1], passes[1:]):
+        partials.append(_expand(items, values, starts, sizes, np.arange(lo, hi), len(labels)))
+        if len(partials) >= COMPACT_EVERY:
+            partials = [_reduce(*map(np.concatenate, zip(*partials)))]
+    if len(partials) != 1:
+        partials = [_reduce(*map(np.concatenate, zip(*partials)))]
+    return _frame(*partials[0], labels)
+
+
+def top_pairs(
+    frame: pd.DataFrame, basket: str, item: str, value: str, k: int = 10, min_support: float = 0.0
+) -> pd.DataFrame:
+    """The `k` items most often bought with each item, like pairs().
+
+    Pairs shared by less than `min_support` of the baskets are dropped.
+    `support` is the share of baskets holding both items and `rank` orders
+    the partners of every `item1`, by count then by value, ties in item order.
+
+    Items are paired in passes, each with all of their partners, so the
+    counts of a pass are final and only the top `k` of every item are kept:
+    memory grows with the number of items times `k`, not with all pairs.
+    """
+    items, values, starts, sizes, labels = _lines(frame, basket, item, value)
+    n_baskets = len(_runs(starts)) - 1
+    min_count = min_support * n_baskets
+
+    # Whole items per pass, about CHUNK_PAIRS line pairs each
+    by_item = np.argsort(items, kind="stable")
+    bounds = _runs(items[by_item])
+    passes = bounds[_passes(np.add.reduceat(sizes[by_item], bounds[:-1]))]
+
+    found = []
+    for lo, hi in zip(passes[:-1], passes[1:]):
+        keys, counts, value1, value2 = _expand(
+            items, values, starts, sizes, by_item[lo:hi], len(labels), diagonal=False
+        )
+        keep = counts >= min_count
+        keys, counts, value1, value2 = keys[keep], counts[keep], value1[keep], value2[keep]
+
+        # The keys come sorted, so the partners of every item are contiguous
+        # and stay so when ranked
+        item1 = keys // len(labels)
+        order = np.lexsort((-value1, -counts, item1))
+        starts_of_item = _runs(item1)
+        rank = np.arange(len(order)) - np.repeat(starts_of_item[:-1], np.diff(starts_of_item)) + 1
+        top = order[rank <= k]
+        part = _frame(keys[top], counts[top], value1[top], value2[top], labels)
+        found.append(part.assign(support=part["count"] / n_baskets, rank=rank[rank <= k]))
+    return pd.concat(found, ignore_index=True)
@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+
+
+def retention(frame: pd.DataFrame, customer: str, period: str) -> tuple[pd.DataFrame, pd.Series]:
+    """Cohort retention of the customers ordering in `frame`.
+
+    `frame` has one row per customer and period (a pandas Period) they
+    ordered in, like the customer_* rollups. Every customer belongs to the
+    cohort of their first period. Returns the cohorts x offsets matrix of the
+    share of each cohort ordering again that many periods later, and the
+    overall retention per offset, i.e. weighted by cohort size. Offsets count
+    the periods present in `frame`; cells past the last period are NaN.
+    """
+    if isinstance(frame[customer].dtype, pd.CategoricalDtype):
+        customers = frame[customer].cat.codes.to_numpy()
+    else:
+        customers = pd.factorize(frame[customer])[0]
+
+    # Rows without a customer (code -1) or a period belong to no cohort
+    known = (customers >= 0) & frame[period].notna().to_numpy()
+    customers = customers[known]
+
+    # Periods are consecutive integers; number the ones present
+    ordinals = pd.PeriodIndex(frame[period][known]).asi8
+    start = ordinals.min()
+    present = np.bincount(ordinals - start) > 0
+    positions = (np.cumsum(present) - 1)[ordinals - start]
+    n = int(present.sum())
+
+    # Each customer's first period, once
+    first = np.full(customers.max() + 1, n)
+    np.minimum.at(first, customers, positions)
+    cohort = first[customers]
+
+    # Customers of every cohort active at every offset
+    active = np.bincount(cohort * n + positions - cohort, minlength=n * n).reshape(n, n)
+    sizes = active[:, 0]
+
+    valid = np.add.outer(np.arange(n), np.arange(n)) < n
+    with np.errstate(invalid="ignore", divide="ignore"):
+        matrix = np.where(valid, active / sizes[:, None], np.nan)
+        overall = (active * valid).sum(axis=0) / (sizes[:, None] * valid).sum(axis=0)
+
+    labels = pd.PeriodIndex.from_ordinals(np.flatnonzero(present) + start, freq=frame[period].dt.freq)
+    return pd.DataFrame(matrix, index=labels), pd.Series(overall)
@@ -0,0 +1,86 @@
+import pandas as pd
+
+from assets import datasets, ingest
+from assets.ingest import MEASURES
+
+
+def load(path) -> pd.DataFrame:
+    """Return the daily cube of the orders stored at `path`, sorted by date.
+
+    It holds the daily totals per dimension combination, so its size depends
+    on the number of days and label combinations, not on the order lines.
+    """
+    return ingest.rollup(path, "daily")
+
+
+def query(path, by=(), start=None, end=None, freq="D", measures=MEASURES):
+    """Roll the cube up to the dimensions `by` between `start` and `end`.
+
+    Both dates are inclusive. `freq` is a period alias ("D", "W", "M", "Q",
+    "Y") and each period is labelled by its first day; with `freq=None` the
+    whole date range is summed up.
+    """
+    cube = load(path)
+    sliced = cube.iloc[datasets.date_window(cube["Order Date"], start, end)]
+
+    keys = list(by)
+    if freq is not None:
+        date = sliced["Order Date"]
+        if freq != "D":
+            date = date.dt.to_period(freq).dt.start_time.rename("Order Date")
+        keys.insert(0, date)
+    if not keys:
+        return sliced[list(measures)].sum()
+    return sliced.groupby(by=keys, observed=True)[list(measures)].sum()
+
+
+def running_totals(path, by: str, measure: str = "Sales") -> pd.DataFrame:
+    """Totals of `measure` per label of `by` up to and including every day.
+
+    One row per day of the cube and one column per label. Built once, it
+    answers the totals of any date window with two row lookups, see
+    window_totals().
+    """
+    cube = load(path)
+    daily = cube.groupby(by=["Order Date", by], observed=True)[measure].sum()
+    return daily.unstack(fill_value=0).cumsum()
+
+
+def window_totals(running: pd.DataFrame, start=None, end=None) -> pd.Series:
+    """Totals per label between `start` and `end` (inclusive) from running_totals().
+
+    Labels without any of the measure in the window are left out, as
+    query(freq=None) leaves out labels without rows.
+    """
+    window = datasets.date_window(running.index, start, end)
+    upto = running.iloc[window.stop - 1].to_numpy() if window.stop else 0
+    before = running.iloc[window.start - 1].to_numpy() if window.start else 0
+    totals = pd.Series(upto - before, index=running.columns, dtype=float)
+    return totals[totals != 0]
+
+
+def canonical(members) -> tuple:
+    """The members of a multiselect as a sorted tuple without repeats.
+
+    Selections that only differ in order then share one cache entry.
+    """
+    return tuple(sorted(set(members)))
+
+
+def combine(partials: pd.DataFrame, selection: dict) -> pd.DataFrame:
+    """Add up the partial aggregates of the selected members.
+
+    `partials` is indexed by the levels of `selection` first and by the keys
+    of the result after them, e.g. query(by=["Segment", *keys], freq=None).
+    `selection` maps each leading level to the members to add up. Only the
+    rows of those members are read, so the cost depends on the selection
+    rather than on the data set.
+    """
+    chosen = tuple(
+        [member for member in canonical(members) if member in partials.index.levels[i]]
+        for i, members in enumerate(selection.values())
+    )
+    return partials.loc[chosen, :].groupby(
+        level=partials.index.names[len(selection):], observed=True
+    ).sum()
+
@@ -0,0 +1,359 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from functools import wraps
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from assets.schema import DTYPES, FILES, READ_OPTIONS, SORTED_BY, align_categories, apply_dtypes
+
+# Frames derived from a shared data set reuse its memory and only copy the
+# columns they actually write to.
+pd.set_option("mode.copy_on_write", True)
+
+# Every Streamlit session runs in a thread of the same process: the registries
+# below are only read and written while holding this lock
+_LOCK = threading.RLock()
+
+# Data sets parsed by this process, keyed by resolved path, as read from
+# their files: the rows appended since are kept apart, see append()
+_FRAMES: dict[Path, pd.DataFrame] = {}
+_APPENDED: dict[Path, list[pd.DataFrame]] = {}
+
+# Per-process caches built on top of the data sets, see derived()
+_DERIVED: list[dict] = []
+
+# Cache clearers to call when a data set changes, see depends_on()
+_DEPENDENTS: dict[Path, list] = {}
+
+# Schema of the files not named in schema.FILES, see register()
+_REGISTERED: dict[Path, str] = {}
+
+# Bumped for one data set by append() and for all of them by clear(): a
+# result of derived() is only kept if its data set did not change meanwhile
+_GENERATIONS: dict[Path, int] = {}
+_CLEARED = 0
+
+# Typed Parquet copies of the CSV files, rebuilt whenever the source changes
+CACHE_DIR = Path(__file__).parent / "cache"
+
+# With WOW_ARROW_MMAP=1 the cache is kept as Arrow IPC files and served
+# memory-mapped, so every server process shares one copy through the OS page
+# cache instead of holding its own frames.
+ARROW_MMAP = os.environ.get("WOW_ARROW_MMAP", "0") not in ("", "0")
+
+
+def _schema(path: Path) -> str | None:
+    with _LOCK:
+        return _REGISTERED.get(path, FILES.get(path.name))
+
+
+def _options(path: Path) -> str:
+    # Part of the cache key: changing how a file is typed rebuilds its cache
+    schema = _schema(path)
+    return repr((
+        READ_OPTIONS.get(schema, {}),
+        DTYPES.get(schema, {}),
+        SORTED_BY.get(schema),
+    ))
+
+
+def _read_csv(path: Path) -> pd.DataFrame:
+    schema = _schema(path)
+    frame = pd.read_csv(path, engine="pyarrow", **READ_OPTIONS.get(schema, {}))
+    frame = apply_dtypes(frame, DTYPES.get(schema, {}))
+    if schema in SORTED_BY:
+        frame = frame.sort_values(by=SORTED_BY[schema], kind="stable")
+    return frame
+
+
+def _sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _cache_files(path: Path) -> tuple[Path, Path]:
+    # Exports of the same name in other directories get caches of their own
+    folder = hashlib.sha256(str(path.parent).encode()).hexdigest()[:8]
+    table = CACHE_DIR / f"{path.stem}-{folder}{'.arrow' if ARROW_MMAP else '.parquet'}"
+    return table, table.with_name(f"{table.name}.json")
+
+
+def _arrow_strings(arrow_type: pa.DataType):
+    if pa.types.is_string(arrow_type) or pa.types.is_large_string(arrow_type):
+        return pd.ArrowDtype(arrow_type)
+    return None
+
+
+def _read_table(table: Path) -> pd.DataFrame:
+    if not ARROW_MMAP:
+        return pd.read_parquet(table)
+    # Numbers and dates become numpy views on the mapping and strings stay
+    # Arrow arrays on it, so nothing but the category codes is copied.
+    # Missing strings are pd.NA rather than NaN in this mode.
+    reader = pa.ipc.open_file(pa.memory_map(str(table)))
+    return reader.read_all().to_pandas(split_blocks=True, types_mapper=_arrow_strings)
+
+
+def _write_table(frame: pd.DataFrame, target: Path):
+    if not ARROW_MMAP:
+        frame.to_parquet(target)
+        return
+    table = pa.Table.from_pandas(frame)
+    with pa.OSFile(str(target), "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+
+
+def _source_info(path: Path, sha256: str | None = None) -> dict:
+    stat = path.stat()
+    return {
+        "mtime_ns": stat.st_mtime_ns,
+        "size": stat.st_size,
+        "sha256": sha256 or _sha256(path),
+        "options": _options(path),
+    }
+
+
+def _write_atomic(target: Path, write):
+    # Several server processes and threads may rebuild the same cache at once,
+    # and files that are already memory-mapped must never be rewritten in place
+    with tempfile.NamedTemporaryFile(
+        dir=target.parent, prefix=f"{target.name}.", suffix=".tmp", delete=False
+    ) as f:
+        tmp = Path(f.name)
+    try:
+        write(tmp)
+        os.replace(tmp, target)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+def _read_cached(path: Path) -> pd.DataFrame | None:
+    table, meta = _cache_files(path)
+    try:
+        cached = json.loads(meta.read_text())
+    except (OSError, ValueError):
+        return None
+
+    stat = path.stat()
+    if cached.get("options") != _options(path):
+        return None
+    if (cached.get("mtime_ns"), cached.get("size")) != (stat.st_mtime_ns, stat.st_size):
+        # Touched but unchanged (e.g. a fresh checkout): keep the cache
+        if cached.get("size") != stat.st_size or cached.get("sha256") != _sha256(path):
+            return None
+        try:
+            info = _source_info(path, cached["sha256"])
+            _write_atomic(meta, lambda tmp: tmp.write_text(json.dumps(info)))
+        except OSError:
+            pass
+
+    try:
+        return _read_table(table)
+    except (OSError, ValueError, pa.ArrowException):
+        return None
+
+
+def _write_cached(path: Path, frame: pd.DataFrame):
+    table, meta = _cache_files(path)
+    try:
+        CACHE_DIR.mkdir(exist_ok=True)
+        _write_atomic(table, lambda tmp: _write_table(frame, tmp))
+        info = _source_info(path)
+        _write_atomic(meta, lambda tmp: tmp.write_text(json.dumps(info)))
+    except OSError:
+        # Read-only deployments simply parse the CSV every time
+        pass
+
+
+def _read(path: Path) -> pd.DataFrame:
+    frame = _read_cached(path)
+    if frame is None:
+        frame = _read_csv(path)
+        _write_cached(path, frame)
+        if ARROW_MMAP:
+            # Serve the mapped file rather than this private parse
+            mapped = _read_cached(path)
+            frame = frame if mapped is None else mapped
+    return frame
+
+
+def _extend(frame: pd.DataFrame, chunks: list[pd.DataFrame], schema: str | None) -> pd.DataFrame:
+    # Categoricals only concatenate as such when their categories match, so
+    # all sides are recoded to the sorted union first.
+    frame, *chunks = align_categories(frame, *chunks)
+    frame = pd.concat([frame, *(rows[frame.columns].astype(frame.dtypes.to_dict()) for rows in chunks)])
+
+    # Intraday rows usually come last already; only re-sort if they do not
+    column = SORTED_BY.get(schema)
+    if column is not None and not frame[column].is_monotonic_increasing:
+        frame = frame.sort_values(by=column, kind="stable")
+    return frame
+
+
+def _parse(path: Path) -> pd.DataFrame:
+    # Held while parsing, so concurrent sessions wait for one parse
+    with _LOCK:
+        if path not in _FRAMES:
+            _FRAMES[path] = _read(path)
+        return _FRAMES[path]
+
+
+def register(path, schema: str):
+    """Type the file stored at `path` as the data set `schema` of assets.schema.
+
+    The bundled files are known by name; exports stored under any other name
+    would otherwise be read untyped and unsorted.
+    """
+    if schema not in READ_OPTIONS:
+        raise ValueError(f"Unknown schema {schema!r}, expected one of {sorted(READ_OPTIONS)}")
+    with _LOCK:
+        _REGISTERED[Path(path).resolve()] = schema
+
+
+def load(path) -> pd.DataFrame:
+    """Return the data set stored at `path`, parsed once per process.
+
+    Every caller gets a shallow copy of the same frame: nothing is copied up
+    front and writes made by one page never reach the shared data.
+    """
+    return _combined(Path(path).resolve()).copy(deep=False)
+
+
+def date_window(dates: pd.Series, start=None, end=None) -> slice:
+    """Positions of the sorted `dates` between `start` and `end`, inclusive."""
+    lo = 0 if start is None else dates.searchsorted(pd.Timestamp(start), side="left")
+    hi = len(dates) if end is None else dates.searchsorted(pd.Timestamp(end), side="right")
+    return slice(lo, hi)
+
+
+def _generation(path: Path) -> tuple[int, int]:
+    return _CLEARED, _GENERATIONS.get(path, 0)
+
+
+def derived(func):
+    """Cache `func` once per process, like the data sets it is built from.
+
+    The first argument of `func` is the path of the data set; its entries are
+    dropped whenever that data set changes.
+    """
+    entries = {}
+
+    @wraps(func)
+    def cached(path, *args):
+        key = (Path(path).resolve(), *args)
+        with _LOCK:
+            if key in entries:
+                return entries[key]
+            generation = _generation(key[0])
+        # Computed without the lock, so other sessions are not held up
+        value = func(path, *args)
+        with _LOCK:
+            # Built from data that has changed since: good for this caller,
+            # but the next one must get a fresh result
+            if _generation(key[0]) != generation:
+                return value
+            return entries.setdefault(key, value)
+
+    cached.entries = entries
+    with _LOCK:
+        _DERIVED.append(entries)
+    return cached
+
+
+def depends_on(*paths):
+    """Clear the decorated cached function whenever one of `paths` changes.
+
+    Meant for the st.cache_data functions of the pages, which would otherwise
+    keep serving the old data until the next restart.
+    """
+    def register(func):
+        with _LOCK:
+            for path in paths:
+                _DEPENDENTS.setdefault(Path(path).resolve(), []).append(func.clear)
+        return func
+    return register
+
+
+@derived
+def _combined(path: Path) -> pd.DataFrame:
+    # The file and the rows appended to it, joined on first use: appending
+    # never copies the (possibly memory-mapped) frame read from the file
+    chunks = appended(path)
+    return _extend(_parse(path), chunks, _schema(path)) if chunks else _parse(path)
+
+
+@derived
+def partitioned(path, column: str) -> tuple[pd.DataFrame, dict]:
+    """Return the data set sorted by `column` and the row range of each value.
+
+    Rows sharing a value are contiguous, so selecting them is a dict lookup
+    and a slice whatever the size of the table.
+    """
+    frame = load(path).sort_values(by=column, kind="stable")
+    values = frame[column].to_numpy()
+    starts = np.flatnonzero(np.r_[True, values[1:] != values[:-1]])
+    stops = np.r_[starts[1:], len(values)]
+    return frame, {
+        value: slice(start, stop)
+        for value, start, stop in zip(values[starts], starts, stops)
+    }
+
+
+def appended(path) -> list[pd.DataFrame]:
+    """Rows added to the data set stored at `path` since its file was read."""
+    with _LOCK:
+        return list(_APPENDED.get(Path(path).resolve(), []))
+
+
+def _typed(path: Path, rows: pd.DataFrame) -> pd.DataFrame:
+    return apply_dtypes(rows, DTYPES.get(_schema(path), {}))
+
+
+def _append(path: Path, rows: pd.DataFrame) -> list:
+    # The part of append() made under the lock, with `rows` already typed: it
+    # only records them. The cache clearers it returns are called once the
+    # lock is released, as they take locks of their own.
+    with _LOCK:
+        _GENERATIONS[path] = _GENERATIONS.get(path, 0) + 1
+        _APPENDED.setdefault(path, []).append(rows)
+        for entries in _DERIVED:
+            for key in [key for key in entries if key[0] == path]:
+                del entries[key]
+        return list(_DEPENDENTS.get(path, []))
+
+
+def append(path, rows: pd.DataFrame) -> pd.DataFrame:
+    """Add `rows` to the data set stored at `path` without reading it again.
+
+    The rows are typed like the file and kept apart from it until the next
+    load() merges them in date order; the file on disk is left alone. Only what was built from this data set is dropped:
+    its derived caches and the functions registered with depends_on().
+    Returns the typed rows.
+    """
+    path = Path(path).resolve()
+    rows = _typed(path, rows)
+    for clear_cache in _append(path, rows):
+        clear_cache()
+    return rows
+
+
+def clear():
+    """Drop every parsed data set, e.g. after the files on disk changed."""
+    global _CLEARED
+    with _LOCK:
+        _CLEARED += 1
+        _FRAMES.clear()
+        _APPENDED.clear()
+        for entries in _DERIVED:
+            entries.clear()
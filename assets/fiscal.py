@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+
+START_MONTHS = range(1, 13)
+
+
+def _parts(dates) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    days = np.asarray(dates, dtype="datetime64[D]")
+    months = days.astype("datetime64[M]")
+    month = months.astype(np.int64)
+    return days, month // 12 + 1970, month % 12 + 1, (days - months).astype(np.int64) + 1
+
+
+def fiscal_year(dates, start_month: int) -> np.ndarray:
+    """The fiscal year of every date, named after the year it starts in."""
+    _, year, month, _ = _parts(dates)
+    return year - (month < start_month)
+
+
+def year_start(dates, start_month: int) -> np.ndarray:
+    """The first day of the fiscal year of every date."""
+    _, year, month, _ = _parts(dates)
+    start = (year - (month < start_month) - 1970) * 12 + start_month - 1
+    return start.astype("datetime64[M]").astype("datetime64[D]")
+
+
+def day_of_year(dates, start_month: int) -> np.ndarray:
+    """Days since the start of the fiscal year, 0 on its first day."""
+    days = np.asarray(dates, dtype="datetime64[D]")
+    return (days - year_start(days, start_month)).astype(np.int64)
+
+
+def aligned(dates, start_month: int) -> np.ndarray:
+    """The dates moved onto a single fiscal year, keeping month and day.
+
+    Lets fiscal years be drawn on top of each other. February falls in 1940,
+    a leap year, so February 29 has a place too.
+    """
+    _, _, month, day = _parts(dates)
+    year = 1940 - (start_month > 2) + (month < start_month)
+    months = ((year - 1970) * 12 + month - 1).astype("datetime64[M]")
+    return months.astype("datetime64[D]") + (day - 1)
+
+
+def running_totals(dates, values) -> pd.DataFrame:
+    """Running totals of `values` since the start of the fiscal year.
+
+    `dates` must be sorted. There is one column per fiscal start month, all
+    taken from a single cumulative sum: the running total of a date is the
+    cumulative sum up to it minus the one before its fiscal year started.
+    """
+    days = np.asarray(dates, dtype="datetime64[D]")
+    total = np.r_[0.0, np.cumsum(np.asarray(values, dtype=float))]
+    return pd.DataFrame({
+        start_month: total[1:] - total[np.searchsorted(days, year_start(days, start_month))]
+        for start_month in START_MONTHS
+    })
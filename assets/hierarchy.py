@@ -0,0 +1,38 @@
+import pandas as pd
+
+
+def totals(frame: pd.DataFrame, levels: list, measure: str) -> list[pd.Series]:
+    """Totals of `measure` at every depth of the hierarchy `levels`.
+
+    `levels` goes from the outermost level to the leaves and the i-th total
+    is indexed by `levels[:i + 1]`. Only the leaves are grouped from `frame`;
+    every parent is summed from the level below it, so the cost of a deeper
+    hierarchy is one more group-by over the (much smaller) child totals.
+    """
+    sums = [frame.groupby(by=list(levels), observed=True)[measure].sum()]
+    for depth in range(len(levels) - 1, 0, -1):
+        sums.insert(0, sums[0].groupby(level=list(range(depth)), observed=True).sum())
+    return sums
+
+
+def annotate(sums: list[pd.Series]) -> pd.DataFrame:
+    """The leaf totals of `sums`, with the total of each ancestor alongside.
+
+    The total at depth i is in the column `level{i}_sum`.
+    """
+    leaves = sums[-1].to_frame()
+    for depth, level_sums in enumerate(sums[:-1]):
+        parents = leaves.index.droplevel(list(range(depth + 1, leaves.index.nlevels)))
+        leaves[f"level{depth}_sum"] = level_sums.reindex(parents).to_numpy()
+    return leaves
+
+
+def children(sums: list[pd.Series], *path) -> pd.Series:
+    """Totals of the children of the node at `path`, e.g. ("Furniture",).
+
+    Read from the precomputed totals, so drilling down never regroups.
+    """
+    level_sums = sums[len(path)]
+    if not path:
+        return level_sums
+    return level_sums.xs(path, level=list(range(len(path))), drop_level=True)
@@ -0,0 +1,184 @@
+import os
+from itertools import chain
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from assets import datasets
+from assets.schema import SUPERSTORE_DTYPES, align_categories, apply_dtypes
+
+# With WOW_STREAMING=1 the orders file is read in chunks of STREAM_CHUNKSIZE
+# lines and folded straight into the rollups below, so the raw table is never
+# held in memory and exports larger than RAM can be served.
+STREAMING = os.environ.get("WOW_STREAMING", "0") not in ("", "0")
+STREAM_CHUNKSIZE = int(os.environ.get("WOW_STREAM_CHUNKSIZE", 500_000))
+
+# Partial results are merged whenever this many chunks have piled up
+COMPACT_EVERY = 8
+
+DIMENSIONS = ["Category", "Sub-Category", "Segment", "Region", "State"]
+MEASURES = ["Sales", "Profit", "Quantity"]
+
+# Aggregates the pages are built from: grouping keys and how every value
+# column is combined. All of them are associative, so chunks fold in any order.
+ROLLUPS = {
+    # Daily totals per dimension combination, see assets.cube
+    "daily": (["Order Date", *DIMENSIONS], dict.fromkeys(MEASURES, "sum")),
+    # Customer activity per quarter, month and week (wk18) and yearly sales
+    # per customer (wk04, wk19)
+    "customer_quarters": (["Customer ID", "Order Quarter"], {"Sales": "sum"}),
+    "customer_months": (["Customer ID", "Order Month"], {"Sales": "sum"}),
+    "customer_weeks": (["Customer ID", "Order Week"], {"Sales": "sum"}),
+    "customer_years": (["Customer Name", "Order Year"], {"Sales": "sum"}),
+    # First order date and sales of every product (wk15)
+    "products": (["Sub-Category", "Product Name"], {"Order Date": "min", "Sales": "sum"}),
+    # Sub-categories and products of every order (wk14)
+    "order_subcategories": (["Order ID", "Sub-Category"], {"Sales": "sum"}),
+    "order_products": (["Order ID", "Product ID"], {"Sales": "sum"}),
+    "product_names": (["Product ID"], {"Product Name": "min"}),
+    # Regional sales of every product per segment (wk06 drill-down)
+    "segment_products": (
+        ["Segment", "Category", "Sub-Category", "Product Name", "Region"], {"Sales": "sum"}
+    ),
+}
+
+COLUMNS = [
+    "Order ID", "Order Date", "Customer ID", "Customer Name", "Segment",
+    "State", "Region", "Product ID", "Category", "Sub-Category", "Product Name",
+    "Sales", "Quantity", "Profit",
+]
+
+
+# Keys derived from the order date
+DERIVED_KEYS = {
+    "Order Quarter": lambda dates: dates.dt.to_period("Q"),
+    "Order Month": lambda dates: dates.dt.to_period("M"),
+    "Order Week": lambda dates: dates.dt.to_period("W"),
+    "Order Year": lambda dates: dates.dt.year,
+}
+
+
+def _prepare(chunk: pd.DataFrame, keys: set) -> pd.DataFrame:
+    return chunk.assign(**{
+        key: derive(chunk["Order Date"])
+        for key, derive in DERIVED_KEYS.items()
+        if key in keys
+    })
+
+
+def _aggregate(frame: pd.DataFrame, keys: list, how: dict) -> pd.DataFrame:
+    return frame.groupby(by=keys, observed=True).agg(how).reset_index()
+
+
+# How two partial aggregates of the same key combine
+COMBINE = {"sum": np.add, "min": np.minimum}
+
+
+def _merge(frame: pd.DataFrame, update: pd.DataFrame, keys: list, how: dict) -> pd.DataFrame:
+    # Only the keys of `update` are touched: those already in `frame` are
+    # combined in place and the others are added after them
+    frame, update = align_categories(frame, update)
+    # Looked up among the rows sharing the first key only, a small subset
+    candidates = np.flatnonzero(frame[keys[0]].isin(update[keys[0]]).to_numpy())
+    hits = pd.MultiIndex.from_frame(frame[keys].iloc[candidates]).get_indexer(
+        pd.MultiIndex.from_frame(update[keys])
+    )
+    known = hits >= 0
+    rows = candidates[hits[known]]
+    combined = {}
+    for col, func in how.items():
+        values = frame[col].to_numpy().copy()
+        values[rows] = COMBINE[func](values[rows], update[col].to_numpy()[known])
+        combined[col] = values
+    merged = frame.assign(**combined)
+    added = update[~known]
+    if added.empty:
+        return merged
+
+    merged = pd.concat([merged, added[merged.columns]], ignore_index=True)
+    # Rollups come in key order; new keys after the last one keep it as is
+    last = tuple(frame[keys].iloc[-1]) if len(frame) else None
+    if last is not None and tuple(added[keys].iloc[0]) <= last:
+        merged = merged.sort_values(by=keys, kind="stable", ignore_index=True)
+    return merged
+
+
+def fold(chunks, rollups=ROLLUPS) -> dict[str, pd.DataFrame]:
+    """Fold an iterable of order frames into the given rollups."""
+    partials = {name: [] for name in rollups}
+    keys_needed = {key for keys, _ in rollups.values() for key in keys}
+    for chunk in chunks:
+        chunk = _prepare(chunk, keys_needed)
+        for name, (keys, how) in rollups.items():
+            partials[name].append(_aggregate(chunk, keys, how))
+            if len(partials[name]) >= COMPACT_EVERY:
+                partials[name] = [_aggregate(pd.concat(partials[name]), keys, how)]
+
+    folded = {}
+    for name, (keys, how) in rollups.items():
+        frame = _aggregate(pd.concat(partials[name]), keys, how)
+        # Chunks carry plain strings; type the labels once at the end
+        folded[name] = apply_dtypes(frame, SUPERSTORE_DTYPES)
+    return folded
+
+
+def read_chunks(path, chunksize: int = STREAM_CHUNKSIZE):
+    """Yield the orders stored at `path` chunk by chunk."""
+    yield from pd.read_csv(
+        path,
+        usecols=COLUMNS,
+        parse_dates=["Order Date"],
+        chunksize=chunksize,
+        encoding="utf-8-sig",
+    )
+
+
+@datasets.derived
+def _stream(path) -> dict[str, pd.DataFrame]:
+    # One pass over the file builds every rollup
+    return fold(chain(read_chunks(path), datasets.appended(path)))
+
+
+@datasets.derived
+def _rollup(path, name: str) -> pd.DataFrame:
+    if STREAMING:
+        return _stream(path)[name]
+    return fold([datasets.load(path)], {name: ROLLUPS[name]})[name]
+
+
+def rollup(path, name: str) -> pd.DataFrame:
+    """Return the rollup `name` of the orders stored at `path`."""
+    return _rollup(path, name).copy(deep=False)
+
+
+def append(path, orders: pd.DataFrame) -> pd.DataFrame:
+    """Add new order lines to the data set stored at `path`.
+
+    The rollups already built are updated from the new lines alone, since
+    every rollup is associative; see datasets.append() for the rest of what
+    is refreshed. Returns the typed order lines.
+    """
+    key = Path(path).resolve()
+    orders = datasets._typed(key, orders)
+    while True:
+        with datasets._LOCK:
+            generation = datasets._generation(key)
+            built = {name: frame for (p, name), frame in _rollup.entries.items() if p == key}
+
+        # Merged without the lock, which is only taken again to swap them in
+        updates = fold([orders], {name: ROLLUPS[name] for name in built}) if built else {}
+        merged = {name: _merge(frame, updates[name], *ROLLUPS[name]) for name, frame in built.items()}
+
+        with datasets._LOCK:
+            # Another append came first: merge into its rollups instead
+            if datasets._generation(key) != generation:
+                continue
+            dependents = datasets._append(key, orders)
+            for name, frame in merged.items():
+                _rollup.entries[key, name] = frame
+        break
+
+    for clear_cache in dependents:
+        clear_cache()
+    return orders
@@ -0,0 +1,79 @@
+import pandas as pd
+
+CATEGORY = "category"
+
+# Superstore orders. Label columns are categoricals, so filters and group-bys
+# run on integer codes and the categories survive every transform.
+SUPERSTORE_DTYPES = {
+    "Order ID": object,
+    "Order Date": "datetime64[ns]",
+    "Ship Date": "datetime64[ns]",
+    "Ship Mode": CATEGORY,
+    "Customer ID": CATEGORY,
+    "Customer Name": object,
+    "Segment": CATEGORY,
+    "Country": object,
+    "City": CATEGORY,
+    "State": CATEGORY,
+    "Postal Code": "int64",
+    "Region": CATEGORY,
+    "Product ID": CATEGORY,
+    "Category": CATEGORY,
+    "Sub-Category": CATEGORY,
+    "Product Name": object,
+    "Sales": "float64",
+    "Quantity": "int64",
+    "Discount": "float64",
+    "Profit": "float64",
+}
+
+# Reader options and column types per data set
+READ_OPTIONS = {
+    "superstore": dict(
+        index_col=0,
+        parse_dates=["Order Date", "Ship Date"],
+    ),
+    "babynames": dict(parse_dates=["year"]),
+    "mlb_ethnicity": dict(parse_dates=["Year"]),
+}
+DTYPES = {
+    "superstore": SUPERSTORE_DTYPES,
+}
+# Data sets kept sorted by a date column, so date windows are binary searches
+SORTED_BY = {
+    "superstore": "Order Date",
+}
+
+# The data set of every bundled file, keyed by file name. Files stored under
+# other names are given theirs with assets.datasets.register().
+FILES = {
+    "18W02_Sample_Superstore.csv": "superstore",
+    "18W08_babynames1950+.csv": "babynames",
+    "18W09_MLB_Ethnicity_1947-2016.csv": "mlb_ethnicity",
+}
+
+
+def apply_dtypes(frame: pd.DataFrame, dtypes: dict) -> pd.DataFrame:
+    # Categories are sorted, so grouped results keep the alphabetical order
+    # the pages got from plain strings.
+    return frame.astype({col: dtype for col, dtype in dtypes.items() if col in frame})
+
+
+def align_categories(*frames: pd.DataFrame) -> list[pd.DataFrame]:
+    """The `frames` with every shared categorical recoded to the sorted union
+    of its categories, so they concatenate and compare as categoricals.
+
+    Frames that already have all of the categories are left as they are.
+    """
+    frames = list(frames)
+    shared = set.intersection(*(set(frame.select_dtypes(include="category").columns) for frame in frames))
+    for col in shared:
+        categories = frames[0][col].cat.categories
+        for frame in frames[1:]:
+            categories = categories.union(frame[col].cat.categories)
+        frames = [
+            frame if frame[col].cat.categories.equals(categories)
+            else frame.assign(**{col: frame[col].cat.set_categories(categories)})
+            for frame in frames
+        ]
+    return frames
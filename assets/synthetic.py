@@ -0,0 +1,233 @@
+"""Write Superstore-shaped order exports of any size.
+
+    python -m assets.synthetic --rows 10000000 --out /data/superstore-10m
+    WOW_SUPERSTORE=/data/superstore-10m/18W02_Sample_Superstore.csv streamlit run app.py
+
+Locations, the product hierarchy, prices, discounts, margins and shipping
+delays are drawn from the sample export, so the pages see the same kind of
+data at any volume.
+"""
+import argparse
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv
+
+import assets
+
+# Named like the sample export
+FILE_NAME = assets.DATA_18W02_SAMPLE.name
+
+# States of us_state_code.csv that the sample has no orders for
+EXTRA_LOCATIONS = pd.DataFrame({
+    "City": ["Anchorage", "Honolulu"],
+    "State": ["Alaska", "Hawaii"],
+    "Postal Code": [99501, 96813],
+    "Region": ["West", "West"],
+})
+
+SHIP_DELAYS = {
+    # Days between order and shipping per ship mode, as in the sample
+    "Same Day": (0, 1),
+    "First Class": (1, 4),
+    "Second Class": (1, 5),
+    "Standard Class": (3, 7),
+}
+
+
+def _popularity(rng: np.random.Generator, n: int, skew: float) -> np.ndarray:
+    # Zipf-like weights in random order: skew=0 is uniform, 1 is a long tail
+    weights = 1.0 / np.arange(1, n + 1) ** skew
+    return rng.permutation(weights / weights.sum())
+
+
+def _customers(rng, sample: pd.DataFrame, n: int) -> pd.DataFrame:
+    names = sample["Customer Name"].drop_duplicates().str.split(" ", n=1, expand=True).dropna()
+    first = rng.choice(names[0].unique(), n)
+    last = rng.choice(names[1].unique(), n)
+    segments = sample.drop_duplicates("Customer ID")["Segment"].astype(str)
+    # Pages group by name, so a name drawn again gets a number
+    names = pd.Series([f"{a} {b}" for a, b in zip(first, last)])
+    namesake = names.groupby(names).cumcount()
+    return pd.DataFrame({
+        "Customer ID": [f"{a[0]}{b[0]}-{10000 + i}" for i, (a, b) in enumerate(zip(first, last))],
+        "Customer Name": [name if v == 0 else f"{name} {v + 1}" for name, v in zip(names, namesake)],
+        "Segment": rng.choice(segments.to_numpy(), n),
+    })
+
+
+def _products(rng, sample: pd.DataFrame, n: int) -> pd.DataFrame:
+    catalog = sample.assign(
+        **{"Unit Price": sample["Sales"] / (sample["Quantity"] * (1 - sample["Discount"]))}
+    ).groupby(by="Product ID", observed=True).agg({
+        "Category": "first",
+        "Sub-Category": "first",
+        "Product Name": "first",
+        "Unit Price": "mean",
+    })
+    picked = catalog.iloc[np.r_[
+        rng.permutation(len(catalog))[:n],
+        rng.integers(0, len(catalog), max(n - len(catalog), 0)),
+    ]].reset_index()
+    # A name drawn again, from the same sample product or from another one
+    # sharing its name, becomes a new variant of it
+    variant = picked.groupby(by="Product Name").cumcount()
+    return pd.DataFrame({
+        "Product ID": [f"{pid[:7]}{10000000 + i}" for i, pid in enumerate(picked["Product ID"].astype(str))],
+        "Category": picked["Category"].astype(str),
+        "Sub-Category": picked["Sub-Category"].astype(str),
+        "Product Name": [
+            name if v == 0 else f"{name} ({v + 1})"
+            for name, v in zip(picked["Product Name"], variant)
+        ],
+        "Unit Price": picked["Unit Price"] * rng.lognormal(0, 0.1, n),
+    })
+
+
+def generate(
+    rows: int,
+    customers: int = 800,
+    products: int = 1900,
+    start="2014-01-01",
+    end="2017-12-31",
+    skew: float = 0.5,
+    lines_per_order: float = 2.0,
+    seed: int = 2018,
+) -> pd.DataFrame:
+    """Return `rows` order lines shaped like the Superstore sample.
+
+    Orders have `lines_per_order` lines on average, all sharing the order
+    date, customer, location and ship mode. Customers place their first order
+    anywhere in the date span; `skew` makes long-standing customers and some
+    products (Zipf-like) more popular. Every state of us_state_code.csv gets
+    orders.
+    """
+    rng = np.random.default_rng(seed)
+    sample = assets.load(assets.DATA_18W02_SAMPLE)
+
+    # Orders, then their lines
+    sizes = rng.geometric(1 / lines_per_order, rows)
+    sizes = sizes[: np.searchsorted(np.cumsum(sizes), rows) + 1]
+    n_orders = len(sizes)
+    order = np.repeat(np.arange(n_orders), sizes)[:rows]
+
+    days = pd.date_range(start, end, freq="D")
+    order_date = days[np.sort(rng.integers(0, len(days), n_orders))]
+    modes = np.array(list(SHIP_DELAYS))
+    mode = rng.choice(len(modes), n_orders, p=sample["Ship Mode"].value_counts(normalize=True)[modes])
+    ship_mode = modes[mode]
+    low, high = np.array(list(SHIP_DELAYS.values()))[mode].T
+    ship_date = order_date + pd.to_timedelta(rng.integers(low, high + 1), unit="D")
+    order_id = [
+        f"{prefix}-{year}-{100000 + i}"
+        for i, (prefix, year) in enumerate(zip(
+            rng.choice(sample["Order ID"].str[:2].to_numpy(), n_orders), order_date.year
+        ))
+    ]
+
+    location_counts = pd.concat([
+        sample[["City", "State", "Postal Code", "Region"]].astype({"City": str, "State": str, "Region": str}),
+        EXTRA_LOCATIONS,
+    ]).groupby(by=["City", "State", "Postal Code", "Region"], sort=False).size()
+    unique_locations = location_counts.index.to_frame(index=False)
+    weights = location_counts.to_numpy() / location_counts.sum()
+    location = rng.choice(len(unique_locations), n_orders, p=weights)
+    # One order in every state first
+    first_per_state = unique_locations.drop_duplicates("State").index.to_numpy()
+    location[rng.permutation(n_orders)[: len(first_per_state)]] = first_per_state[: n_orders]
+
+    # Customers join over the whole span, so every quarter has a cohort, and
+    # then keep ordering; the longest-standing ones order most with skew > 0
+    customers = min(customers, n_orders)
+    customer_table = _customers(rng, sample, customers)
+    first_order = np.r_[0, np.sort(rng.choice(np.arange(1, n_orders), customers - 1, replace=False))]
+    joined = np.searchsorted(first_order, np.arange(n_orders), side="right")
+    customer = (joined * rng.random(n_orders) ** (1 + skew)).astype(int)
+    customer[first_order] = np.arange(customers)
+
+    # Lines
+    product_table = _products(rng, sample, products)
+    product = rng.choice(products, rows, p=_popularity(rng, products, skew))
+    pick = rng.integers(0, len(sample), rows)
+    quantity = sample["Quantity"].to_numpy()[rng.integers(0, len(sample), rows)]
+    discount = sample["Discount"].to_numpy()[pick]
+    margin = (sample["Profit"] / sample["Sales"]).to_numpy()[pick]
+    sales = np.round(product_table["Unit Price"].to_numpy()[product] * quantity * (1 - discount), 4)
+
+    def per_order(values):
+        return np.asarray(values)[order]
+
+    frame = pd.DataFrame({
+        "Order ID": pd.Categorical.from_codes(order, order_id),
+        "Order Date": per_order(order_date),
+        "Ship Date": per_order(ship_date),
+        "Ship Mode": per_order(ship_mode),
+        **{
+            col: per_order(customer_table[col].to_numpy()[customer])
+            for col in ["Customer ID", "Customer Name", "Segment"]
+        },
+        "Country": "United States",
+        **{
+            col: per_order(unique_locations[col].to_numpy()[location])
+            for col in ["City", "State", "Postal Code", "Region"]
+        },
+        **{
+            col: product_table[col].to_numpy()[product]
+            for col in ["Product ID", "Category", "Sub-Category", "Product Name"]
+        },
+        "Sales": sales,
+        "Quantity": quantity,
+        "Discount": discount,
+        "Profit": np.round(sales * margin, 4),
+    }, index=pd.RangeIndex(1, rows + 1, name="Row ID"))
+    return frame
+
+
+def write(frame: pd.DataFrame, out) -> Path:
+    """Write `frame` as a Superstore export into the directory `out`."""
+    out = Path(out)
+    out.mkdir(parents=True, exist_ok=True)
+    target = out / FILE_NAME
+    table = pa.Table.from_pandas(
+        frame.astype({"Order Date": "datetime64[s]", "Ship Date": "datetime64[s]"}).reset_index(),
+        preserve_index=False,
+    )
+    table = table.set_column(
+        table.schema.get_field_index("Order Date"), "Order Date", table["Order Date"].cast(pa.date32())
+    ).set_column(
+        table.schema.get_field_index("Ship Date"), "Ship Date", table["Ship Date"].cast(pa.date32())
+    )
+    pa.csv.write_csv(table, target)
+    return target
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write a synthetic Superstore export.")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--customers", type=int, default=800)
+    parser.add_argument("--products", type=int, default=1900)
+    parser.add_argument("--start", default="2014-01-01")
+    parser.add_argument("--end", default="2017-12-31")
+    parser.add_argument("--skew", type=float, default=0.5, help="popularity skew, 0 is uniform")
+    parser.add_argument("--lines-per-order", type=float, default=2.0)
+    parser.add_argument("--seed", type=int, default=2018)
+    parser.add_argument("--out", type=Path, required=True, help="directory to write into")
+    args = parser.parse_args(argv)
+
+    frame = generate(
+        args.rows,
+        customers=args.customers,
+        products=args.products,
+        start=args.start,
+        end=args.end,
+        skew=args.skew,
+        lines_per_order=args.lines_per_order,
+        seed=args.seed,
+    )
+    print(write(frame, args.out))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,259 @@
+"""Time the loading, transforms and figures of the challenge pages headless.
+
+    python -m benchmarks.run                    # every page
+    python -m benchmarks.run wk14 wk18          # some pages only
+    python -m benchmarks.run --save-reference   # store the outputs
+    python -m benchmarks.run --check            # compare with the stored outputs
+
+st.cache_data is bypassed, so every call does the full work. The first call of
+a case is reported as "cold" (per-process caches such as the parsed data sets
+and the rollups are dropped before it), the best and median of the following
+repeats as "warm".
+"""
+import argparse
+import importlib
+import math
+import pickle
+import statistics
+import sys
+import time
+from datetime import datetime
+from itertools import product
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import streamlit as st
+
+import assets
+
+REFERENCE = Path(__file__).parent / "reference.pkl"
+
+YEARS = [2014, 2015, 2016, 2017]
+CATEGORIES = ["Furniture", "Office Supplies", "Technology"]
+SEGMENTS = ["Consumer", "Corporate", "Home Office"]
+DATES = [datetime(2015, 1, 31), datetime(2016, 12, 5), datetime(2017, 6, 28), datetime(2017, 12, 30)]
+
+
+def _passthrough(func=None, **kwargs):
+    # Stands in for st.cache_data: keeps .clear() for assets.depends_on()
+    if func is None:
+        return _passthrough
+    func.clear = lambda: None
+    return func
+
+
+def _pages():
+    st.cache_data = _passthrough
+    return {
+        f"wk{n:02}": importlib.import_module(f"pages.wow_18.wk{n:02}")
+        for n in range(1, 20)
+    }
+
+
+def _cases(pages):
+    """Yield (page, stage, params, call) for the whole parameter grid."""
+    wk = pages
+
+    for name in ("wk01",):
+        # Built at import time
+        yield name, "import", "", lambda name=name: importlib.reload(wk[name])
+
+    for name, page in wk.items():
+        if hasattr(page, "load_data"):
+            yield name, "load", "", page.load_data
+
+    for first_year, min_growth in product((2014, 2016), (0.0, 0.25)):
+        label = f"first_year={first_year} min_growth={min_growth}"
+        yield "wk04", "transform", label, lambda y=first_year, g=min_growth: wk["wk04"].transform_data(y, 2017, g)
+        yield "wk04", "figure", label, lambda y=first_year, g=min_growth: wk["wk04"].get_figure(y, 2017, g)
+
+    for month in range(1, 13):
+        yield "wk02", "transform", f"start_month={month}", lambda m=month: wk["wk02"].get_fiscal_data(m)
+        yield "wk02", "figure", f"start_month={month}", lambda m=month: wk["wk02"].plot_fiscal_data(m)
+
+    for year, month in product(YEARS, (1, 6, 12)):
+        date = datetime(year, month, 1)
+        yield "wk03", "figure", f"date={date:%Y-%m}", lambda d=date: wk["wk03"].get_figure(d)
+    yield "wk03", "transform", "", wk["wk03"].transform_data
+    for window in (3, 6, 12):
+        yield "wk03", "transform", f"window={window}", lambda w=window: wk["wk03"].get_rolling_sales(w)
+        date = datetime(2016, 6, 1)
+        yield "wk03", "figure", f"date={date:%Y-%m} window={window}", lambda d=date, w=window: wk["wk03"].get_figure(d, w)
+
+    for years, month in product((YEARS, [2015], [2016, 2014]), (1, 6, 11)):
+        label = f"years={years} start_month={month}"
+        yield "wk05", "transform", label, lambda y=years, m=month: wk["wk05"].trans_data(y, m)
+        yield "wk05", "figure", label, lambda y=years, m=month: wk["wk05"].get_figure(y, m)
+
+    for segments in (SEGMENTS, ["Corporate"], ["Consumer", "Home Office"]):
+        label = f"segments={segments}"
+        yield "wk06", "transform", label, lambda s=segments: wk["wk06"].transform_data(*s)
+        yield "wk06", "figure", label, lambda s=segments: wk["wk06"].plot_figure(*s)
+        for category, sub_category in (("Furniture", "Chairs"), ("Technology", "Phones")):
+            yield "wk06", "transform", f"{label} drill-down={sub_category}", (
+                lambda c=category, sc=sub_category, s=segments: wk["wk06"].drill_down(c, sc, *s)
+            )
+
+    for years, categories in product((YEARS, [2014, 2016]), (CATEGORIES, ["Technology"])):
+        label = f"years={years} categories={categories}"
+        yield "wk07", "transform", label, lambda y=years, c=categories: wk["wk07"].transform_data(y, c)
+        yield "wk07", "figure", label, lambda y=years, c=categories: wk["wk07"].get_figure(y, c)
+
+    for name in ("Rody", "Emma", "Zzyzx"):
+        yield "wk08", "transform", f"name={name}", lambda n=name: wk["wk08"].transform_data(n)
+        yield "wk08", "figure", f"name={name}", lambda n=name: wk["wk08"].get_figure(n)
+
+    yield "wk09", "figure", "", wk["wk09"].get_figure
+
+    for name in ("wk10", "wk11", "wk14", "wk17", "wk18"):
+        transform = getattr(wk[name], "transform_data", None) or wk[name].calculate_data
+        yield name, "transform", "", transform
+    yield "wk10", "figure", "", wk["wk10"].get_figure
+    yield "wk10", "transform", "spoke=Day", lambda: wk["wk10"].transform_data("Day")
+    yield "wk10", "figure", "spoke=Day", lambda: wk["wk10"].get_figure("Day")
+    yield "wk11", "figure", "", wk["wk11"].get_figure
+    yield "wk14", "figure", "", wk["wk14"].get_figure
+    for top_k in (1, 5, 10):
+        label = f"products top_k={top_k}"
+        yield "wk14", "transform", label, lambda k=top_k: wk["wk14"].calculate_product_pairs(k)
+        yield "wk14", "figure", label, lambda k=top_k: wk["wk14"].get_product_figure(k)
+
+    for date in DATES:
+        label = f"date={date:%Y-%m-%d}"
+        yield "wk12", "transform", label, lambda d=date: wk["wk12"].transform_data(d)
+        yield "wk12", "figure", label, lambda d=date: wk["wk12"].get_figure(d)
+
+    for year, measure in product(YEARS, ("Sales", "% of Total", "% Diff")):
+        label = f"year={year} measure={measure}"
+        yield "wk13", "transform", label, lambda y=year, m=measure: wk["wk13"].transform_data(y, m)
+        yield "wk13", "figure", label, lambda y=year, m=measure: wk["wk13"].get_figure(y, m)
+
+    yield "wk15", "transform", "", wk["wk15"].transform_data
+    yield "wk15", "figure", "intermediate", wk["wk15"].get_intermediate_figure
+    yield "wk15", "figure", "jedi", wk["wk15"].get_jedi_figure
+
+    for date, period, number in product(DATES, ("Day", "Week", "Month"), (1, 6, 12)):
+        label = f"date={date:%Y-%m-%d} period={period} n={number}"
+        yield "wk16", "transform", label, lambda d=date, p=period, n=number: wk["wk16"].transform_data(d, p, n)
+        yield "wk16", "figure", label, lambda d=date, p=period, n=number: wk["wk16"].get_figure(d, p, n)
+
+    for chart in ("Step", "Jump", "Linear"):
+        yield "wk17", "figure", f"chart={chart}", lambda c=chart: wk["wk17"].get_figure(c)
+
+    yield "wk18", "figure", "intermediate", wk["wk18"].get_intermediate_figure
+    yield "wk18", "figure", "jedi", wk["wk18"].get_jedi_figure
+    for granularity in ("Month", "Week"):
+        label = f"granularity={granularity}"
+        yield "wk18", "transform", label, lambda g=granularity: wk["wk18"].transform_data(g)
+        yield "wk18", "figure", f"jedi {label}", lambda g=granularity: wk["wk18"].get_jedi_figure(g)
+
+    yield "wk19", "figure", "customers", wk["wk19"].get_customer_sales_figure
+    yield "wk19", "figure", "sub-categories", wk["wk19"].get_subcategory_sales_figure
+    yield "wk19", "figure", "states", wk["wk19"].get_state_sales_figure
+
+
+def _output(result):
+    # Plain data that can be pickled and compared
+    if isinstance(result, go.Figure):
+        return result.to_dict()
+    if isinstance(result, type(sys)):
+        # Pages built at import time: keep what they built
+        return {
+            name: _output(value)
+            for name, value in vars(result).items()
+            if isinstance(value, (pd.DataFrame, go.Figure)) and not name.startswith("_")
+        }
+    return result
+
+
+def _same(expected, actual, where=""):
+    """Raise AssertionError where `actual` differs from `expected`."""
+    if isinstance(expected, pd.DataFrame):
+        pd.testing.assert_frame_equal(expected, actual, check_exact=False, obj=where)
+    elif isinstance(expected, pd.Series):
+        pd.testing.assert_series_equal(expected, actual, check_exact=False, obj=where)
+    elif isinstance(expected, dict):
+        assert isinstance(actual, dict) and expected.keys() == actual.keys(), f"{where}: keys differ"
+        for key in expected:
+            _same(expected[key], actual[key], f"{where}.{key}")
+    elif isinstance(expected, (list, tuple, np.ndarray)):
+        assert isinstance(actual, (list, tuple, np.ndarray)), f"{where}: {actual!r}"
+        assert len(expected) == len(actual), f"{where}: {len(expected)} != {len(actual)} items"
+        for i, (left, right) in enumerate(zip(expected, actual)):
+            _same(left, right, f"{where}[{i}]")
+    elif isinstance(expected, (float, np.floating)) and not isinstance(actual, (str, bytes)):
+        assert (math.isnan(expected) and math.isnan(actual)) or math.isclose(
+            expected, actual, rel_tol=1e-9, abs_tol=1e-9
+        ), f"{where}: {expected!r} != {actual!r}"
+    else:
+        assert expected == actual, f"{where}: {expected!r} != {actual!r}"
+
+
+def run(pages, only=(), repeat=5):
+    results, outputs = [], {}
+    for page, stage, params, call in _cases(pages):
+        if only and page not in only:
+            continue
+        assets.clear()
+        timings = []
+        try:
+            for _ in range(repeat + 1):
+                start = time.perf_counter()
+                result = call()
+                timings.append(time.perf_counter() - start)
+        except FileNotFoundError as e:
+            print(f"{page:5} {stage:9} {params}: skipped ({e.filename} missing)")
+            continue
+
+        key = f"{page}/{stage}/{params}"
+        outputs[key] = _output(result)
+        cold, warm = timings[0], timings[1:]
+        results.append((key, cold, min(warm), statistics.median(warm)))
+        print(
+            f"{page:5} {stage:9} cold {cold * 1e3:9.2f} ms  best {min(warm) * 1e3:9.2f} ms  "
+            f"median {statistics.median(warm) * 1e3:9.2f} ms  {params}"
+        )
+    return results, outputs
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("pages", nargs="*", help="pages to run, e.g. wk14 (default: all)")
+    parser.add_argument("-n", "--repeat", type=int, default=5, help="warm calls per case")
+    parser.add_argument("--save-reference", action="store_true", help=f"store the outputs in {REFERENCE.name}")
+    parser.add_argument("--check", action="store_true", help=f"compare the outputs with {REFERENCE.name}")
+    parser.add_argument("--reference", type=Path, default=REFERENCE)
+    args = parser.parse_args(argv)
+
+    pages = _pages()
+    _, outputs = run(pages, only=args.pages, repeat=args.repeat)
+
+    if args.save_reference:
+        stored = {}
+        if args.reference.exists():
+            stored = pickle.loads(args.reference.read_bytes())
+        stored.update(outputs)
+        args.reference.write_bytes(pickle.dumps(stored))
+        print(f"saved {len(outputs)} outputs to {args.reference}")
+
+    if args.check:
+        stored = pickle.loads(args.reference.read_bytes())
+        failed = 0
+        for key, output in outputs.items():
+            if key not in stored:
+                print(f"no reference: {key}")
+                continue
+            try:
+                _same(stored[key], output, key)
+            except AssertionError as e:
+                failed += 1
+                print(f"DIFFERS {key}\n    {str(e).splitlines()[0][:400]}")
+        print(f"checked {len(outputs)} outputs, {failed} differ")
+        return 1 if failed else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
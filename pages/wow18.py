@@ -142,13 +142,35 @@ with plotly:
             format="MMM-YY",
             label_visibility="collapsed",
         )
-        fig = wk03.get_figure(param_date.replace(day=1))
+        window = st.radio(
+            label="Rolling window (months):",
+            options=list(wk03.WINDOWS),
+            horizontal=True,
+            key="wk03_window",
+        )
+        fig = wk03.get_figure(param_date.replace(day=1), window)
         plot_region.plotly_chart(fig, use_container_width=True)
     elif challenge == "wow18wk04":
         from pages.wow_18 import wk04
 
+        col1, col2 = st.columns([1, 1])
+        first_year, last_year = col1.slider(
+            label="Years",
+            min_value=2014,
+            max_value=2017,
+            value=(2014, 2017),
+            key="wk04_years",
+        )
+        min_growth = col2.slider(
+            label="Minimum yearly growth (%)",
+            min_value=0,
+            max_value=100,
+            value=0,
+            step=5,
+            key="wk04_min_growth",
+        )
         st.plotly_chart(
-            wk04.fig,
+            wk04.get_figure(first_year, last_year, min_growth / 100),
             use_container_width=True,
             theme=None,
         )
@@ -189,6 +211,26 @@ with plotly:
         )
         fig = wk06.plot_figure(*segment)
         st.plotly_chart(fig, use_container_width=True)
+        sub_categories = wk06.transform_data(*segment)
+        if len(sub_categories):
+            # Sub-category -> category, top of the chart first
+            parents = dict(
+                sub_categories[["Sub-Category", "Category"]].iloc[::-1].itertuples(index=False)
+            )
+            sub_category = st.selectbox(
+                label="Drill down into",
+                options=list(parents),
+                format_func=lambda sub: f"{parents[sub]} > {sub}",
+                index=None,
+                placeholder="Choose a sub-category",
+                key="wk06_sub_category",
+            )
+            if sub_category:
+                st.dataframe(
+                    wk06.drill_down(parents[sub_category], sub_category, *segment),
+                    use_container_width=True,
+                    hide_index=True,
+                )
     elif challenge == "wow18wk07":
         from pages.wow_18 import wk07
 
@@ -242,7 +284,13 @@ with plotly:
     elif challenge == "wow18wk10":
         from pages.wow_18 import wk10
 
-        fig = wk10.get_figure()
+        spoke = st.radio(
+            label="One spoke per:",
+            options=["Week", "Day"],
+            horizontal=True,
+            key="wk10_spoke",
+        )
+        fig = wk10.get_figure(spoke)
         st.plotly_chart(fig, theme=None)
     elif challenge == "wow18wk11":
         from pages.wow_18 import wk11
@@ -253,11 +301,11 @@ with plotly:
         from pages.wow_18 import wk12
 
         st.markdown("### Sub-Category Sales Change in the Last Two Periods")
-        data18w12 = wk12.load_data()
+        first_date, last_date = wk12.get_running_sales().index[[0, -1]]
         current_max_date = st.slider(
             label="Set Max Order Date:",
-            min_value=data18w12["Order Date"].min(),
-            max_value=data18w12["Order Date"].max(),
+            min_value=first_date,
+            max_value=last_date,
             value=datetime(2017, 3, 13),
             key="current_max_date",
         )
@@ -288,7 +336,24 @@ with plotly:
         )
     elif challenge == "wow18wk14":
         from pages.wow_18 import wk14
-        fig = wk14.get_figure()
+        col1, col2 = st.columns([1, 1])
+        level = col1.radio(
+            label="Frequency of:",
+            options=["Sub-Category", "Product"],
+            horizontal=True,
+            key="wk14_level",
+        )
+        if level == "Product":
+            top_k = col2.slider(
+                label="Partners per product:",
+                min_value=1,
+                max_value=10,
+                value=5,
+                key="wk14_top_k",
+            )
+            fig = wk14.get_product_figure(top_k)
+        else:
+            fig = wk14.get_figure()
         st.plotly_chart(fig, use_container_width=True, theme=None)
     elif challenge == "wow18wk15":
         from pages.wow_18 import wk15
@@ -350,11 +415,16 @@ with plotly:
         st.plotly_chart(fig, use_container_width=True, theme=None)
     elif challenge == "wow18wk18":
         from pages.wow_18 import wk18
+        granularity = st.selectbox(
+            label="Cohort Period:",
+            options=list(wk18.PERIODS),
+            key="wk18_granularity",
+        )
         st.markdown("##### Intermediate figure:")
-        fig = wk18.get_intermediate_figure()
+        fig = wk18.get_intermediate_figure(granularity)
         st.plotly_chart(fig, use_container_container=True)
         st.markdown("##### Jedi figure:")
-        fig = wk18.get_jedi_figure()
+        fig = wk18.get_jedi_figure(granularity)
         st.plotly_chart(fig, use_container_width=True)
     elif challenge == "wow18wk19":
         from pages.wow_18 import wk19
@@ -394,12 +464,18 @@ with data:
     elif challenge == "wow18wk03":
         from pages.wow_18 import wk03
 
-        data = wk03.data18w03_grouped.reset_index().iloc[:, [0, 1, 3]]
+        window = st.session_state["wk03_window"]
+        data = wk03.transform_data().assign(
+            **{f"Rolling {window} Month Sales": wk03.get_rolling_sales(window)}
+        ).reset_index().iloc[:, [0, 1, 3, 4]]
         st.dataframe(data, use_container_width=True)
     elif challenge == "wow18wk04":
         from pages.wow_18 import wk04
 
-        st.dataframe(wk04.data18w04_filtered, use_container_width=True)
+        data = wk04.transform_data(
+            *st.session_state["wk04_years"], st.session_state["wk04_min_growth"] / 100
+        )
+        st.dataframe(data, use_container_width=True)
     elif challenge == "wow18wk05":
         from pages.wow_18 import wk05
 
@@ -440,7 +516,7 @@ with data:
     elif challenge == "wow18wk10":
         from pages.wow_18 import wk10
 
-        data = wk10.transform_data().reset_index()
+        data = wk10.transform_data(st.session_state["wk10_spoke"]).reset_index()
         st.dataframe(data.iloc[:, [0, 1, 2]], use_container_width=True)
     elif challenge == "wow18wk11":
         from pages.wow_18 import wk11
@@ -461,7 +537,10 @@ with data:
         st.dataframe(data, use_container_width=True)
     elif challenge == "wow18wk14":
         from pages.wow_18 import wk14
-        data = wk14.calculate_data()
+        if st.session_state["wk14_level"] == "Product":
+            data = wk14.calculate_product_pairs(st.session_state["wk14_top_k"])
+        else:
+            data = wk14.calculate_data()
         st.dataframe(data, use_container_width=True)
     elif challenge == "wow18wk15":
         from pages.wow_18 import wk15
@@ -481,7 +560,7 @@ with data:
         st.dataframe(data, use_container_width=True)
     elif challenge == "wow18wk18":
         from pages.wow_18 import wk18
-        data = wk18.transform_data()
+        data = wk18.transform_data(st.session_state["wk18_granularity"])
         st.dataframe(data, use_container_width=True)
     elif challenge == "wow18wk19":
         from pages.wow_18 import wk19
@@ -1,10 +1,9 @@
 import plotly.express as px
 import plotly.graph_objects as go
-import pandas as pd
 import assets
 
 
-data18w01 = pd.read_csv(assets.DATA_18W01)
+data18w01 = assets.load(assets.DATA_18W01)
 
 filter_cond = data18w01["Measure"].str.contains("Ranked personality higher than looks")
 data18w01_filtered = (
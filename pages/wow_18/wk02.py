@@ -1,39 +1,43 @@
 import plotly.graph_objects as go
 import pandas as pd
-import numpy as np
 import streamlit as st
-from datetime import datetime, timedelta
+from datetime import timedelta
 import assets
 
-data18w02 = pd.read_csv(assets.DATA_18W02, index_col=0, parse_dates=[
-                        "Order Date", "Ship Date"], engine="pyarrow")
-
-def get_fiscal_year(start: int, date: datetime) -> int:
-    if date.month >= start:
-        return date.year
-    return date.year - 1
-
-def strptime(df: pd.DataFrame, start: int):
-    cond = df["Fiscal_year"] < df["Order Date"].dt.year
-    year = 1941 if start <= 2 else 1940
-    return np.where(cond, df["Month_day"] + f", {year}", df["Month_day"] + f", {year-1}")
+@assets.depends_on(assets.DATA_18W02)
+@st.cache_data
+def get_daily_sales() -> pd.DataFrame:
+    data18w02_filtered = assets.cube.query(
+        assets.DATA_18W02, measures=["Sales"]).reset_index()
+    return data18w02_filtered.assign(
+        Month_day=data18w02_filtered["Order Date"].dt.strftime("%B %d"),
+    )
 
-data18w02_filtered = data18w02.loc[:, ["Order Date", "Sales"]].groupby(
-    by="Order Date").sum().reset_index()
-data18w02_filtered = data18w02_filtered.assign(
-    Month_day=data18w02_filtered["Order Date"].dt.strftime("%B %d"),
-)
+@assets.depends_on(assets.DATA_18W02)
+@st.cache_data
+def get_running_sales() -> pd.DataFrame:
+    # Running sales of every fiscal start month, switching months is a lookup
+    data18w02_filtered = get_daily_sales()
+    return assets.fiscal.running_totals(
+        data18w02_filtered["Order Date"], data18w02_filtered["Sales"])
 
+@assets.depends_on(assets.DATA_18W02)
 @st.cache_data
 def get_fiscal_data(start_month: int) -> pd.DataFrame:
+    data18w02_filtered = get_daily_sales()
     return data18w02_filtered.assign(
-        Fiscal_year=data18w02_filtered["Order Date"].apply(
-            lambda d: get_fiscal_year(start_month, d)),
+        Fiscal_year=assets.fiscal.fiscal_year(
+            data18w02_filtered["Order Date"], start_month),
     )
 
+@assets.depends_on(assets.DATA_18W02)
 @st.cache_data
 def plot_fiscal_data(start_month: int):
-    data18w02_fiscal = get_fiscal_data(start_month)
+    data18w02_fiscal = get_fiscal_data(start_month).assign(
+        Running_sales=get_running_sales()[start_month].to_numpy(),
+        x_datetime=assets.fiscal.aligned(
+            get_daily_sales()["Order Date"], start_month).astype("datetime64[ns]"),
+    )
     
     fiscal_years = data18w02_fiscal["Fiscal_year"].value_counts().index
     data = []
@@ -41,22 +45,15 @@ def plot_fiscal_data(start_month: int):
     for year in fiscal_years:
         filter_cond = data18w02_fiscal["Fiscal_year"] == year
         data18w02_year = data18w02_fiscal.loc[filter_cond, :]
-        data18w02_year = data18w02_year.assign(
-            Running_sales=data18w02_year["Sales"].cumsum(),
-            x_datestr=strptime(data18w02_year, start_month),
-        )
-        data18w02_year = data18w02_year.assign(
-                x_datetime=data18w02_year["x_datestr"].apply(lambda d: datetime.strptime(d, "%B %d, %Y"))
-            )
         
         data.append(go.Scatter(
             name=str(year),
             x=data18w02_year.loc[:, "x_datetime"],
             y=data18w02_year["Running_sales"],
-            customdata=data18w02_year,
-            hovertemplate=("Fiscal Year: %{customdata[3]}<br>"
+            customdata=data18w02_year[["Order Date", "Fiscal_year", "Running_sales"]],
+            hovertemplate=("Fiscal Year: %{customdata[1]}<br>"
                         "%{customdata[0]|%Y/%m/%d}<br>"
-                        "Running Sum of Sales: %{customdata[4]:$,.0f}<extra></extra>"
+                        "Running Sum of Sales: %{customdata[2]:$,.0f}<extra></extra>"
             ),
             showlegend=False,
             line_width=3,
@@ -1,48 +1,58 @@
 import plotly.graph_objects as go
-import pandas as pd
 from datetime import datetime
 import streamlit as st
 import assets
 
 
-data18w03 = pd.read_csv(
-    assets.DATA_18W03,
-    index_col=0,
-    parse_dates=["Order Date", "Ship Date"],
-    engine="pyarrow",
-)
-
-filter_cond = (data18w03["Order Date"] >= datetime(2014, 1, 1)) & (
-    data18w03["Order Date"] <= datetime(2018, 3, 30)
-)
 xlim = (datetime(2014, 1, 1), datetime(2018, 3, 30))
 
-data18w03_filtered = data18w03.loc[filter_cond, ["Order Date", "Category", "Sales"]]
+# Rolling windows offered, in months
+WINDOWS = {3: "three", 6: "six", 12: "twelve"}
 
-data18w03_grouped = (
-    data18w03_filtered.assign(
-        Year_Month=data18w03_filtered["Order Date"].apply(lambda d: d.replace(day=1))
-    )
-    .groupby(by=["Category", "Year_Month"])
-    .agg({"Order Date": "min", "Sales": "sum"})
-)
+
+@assets.depends_on(assets.DATA_18W03)
+@st.cache_data
+def transform_data():
+    data18w03_filtered = assets.cube.query(
+        assets.DATA_18W03, by=["Category"], start=xlim[0], end=xlim[1], measures=["Sales"]
+    ).reset_index()
+    year_month = data18w03_filtered["Order Date"].dt.to_period("M").dt.start_time
+
+    return data18w03_filtered.groupby(
+        by=["Category", year_month.rename("Year_Month")], observed=True
+    ).agg({"Order Date": "min", "Sales": "sum"})
 
 
+@assets.depends_on(assets.DATA_18W03)
 @st.cache_data
-def get_figure(param_date):
+def get_cumulative_sales():
+    # Running monthly sales, restarting with every category
+    return transform_data()["Sales"].groupby(level="Category", observed=True).cumsum()
+
+
+def get_rolling_sales(window=3):
+    # Sales of the last `window` months: the running sales minus the running
+    # sales `window` months earlier
+    cumulative = get_cumulative_sales()
+    earlier = cumulative.groupby(level="Category", observed=True).shift(window, fill_value=0)
+    return cumulative - earlier
+
+
+@assets.depends_on(assets.DATA_18W03)
+@st.cache_data
+def get_figure(param_date, window=3):
     colors = {
         "Technology": "#ADA758",
         "Furniture": "#AA7E93",
         "Office Supplies": "#71A790",
     }
+    data18w03_rolling = get_rolling_sales(window)
 
     data_left = []
     data_right = []
     data_text = []
-    for cat in data18w03_grouped.index.get_level_values("Category").unique():
-        cat_data = (
-            data18w03_grouped.loc[(cat,), "Sales"].rolling(3, min_periods=1).sum()
-        )
+    for cat in data18w03_rolling.index.get_level_values("Category").unique():
+        cat_data = data18w03_rolling.loc[(cat,)]
 
         filter = cat_data.index <= param_date
         data_left.append(
@@ -56,7 +66,7 @@ def get_figure(param_date):
                 ),
                 hovertemplate=(f"Category: {cat}<br>"
                                "Order Month: %{x}<br>"
-                               "Rolling 3 month sales: $%{y:,.0f}"
+                               f"Rolling {window} month sales: $%{{y:,.0f}}"
                                "<extra></extra>"
                 ),
             )
@@ -77,7 +87,7 @@ def get_figure(param_date):
                 showlegend=False,
                 hovertemplate=(f"Category: {cat}<br>"
                                "Order Month: %{x}<br>"
-                               "Rolling 3 month sales: $%{y:,.0f}"
+                               f"Rolling {window} month sales: $%{{y:,.0f}}"
                                "<extra></extra>"
                 ),
             )
@@ -95,7 +105,7 @@ def get_figure(param_date):
                 showlegend=False,
                 hovertemplate=(f"Category: {cat}<br>"
                                "Order Month: %{x}<br>"
-                               "Rolling 3 month sales: $%{y:,.0f}"
+                               f"Rolling {window} month sales: $%{{y:,.0f}}"
                                "<extra></extra>"
                 ),
             )
@@ -149,7 +159,7 @@ def get_figure(param_date):
         ),
     )
     fig.add_annotation(
-        text="<i>Rolling three month sales: a retrospective</i>",
+        text=f"<i>Rolling {WINDOWS[window]} month sales: a retrospective</i>",
         font_size=18,
         showarrow=False,
         x=0.5,
@@ -1,3 +1,4 @@
+import calendar
 import plotly.express as px
 import plotly.graph_objects as go
 import pandas as pd
@@ -9,56 +10,55 @@ import assets
 bar_fill_color = "#BAB0AC"
 bar_highlight_color = "#4E79A7"
 
-def convert_month_name(dt, start_month, long=False):
-    if (dt.month - start_month < 3 and dt.month - start_month >= 0) or dt.month - start_month < -9:
-        return "Q1"
-    elif (dt.month - start_month < 6 and dt.month - start_month >= 0) or dt.month - start_month < -6:
-        return "Q2"
-    else:
-        return dt.strftime("%B" if long else "%b")
-
+@assets.depends_on(assets.DATA_18W05)
 @st.cache_data
-def load_data():
-    return pd.read_csv(
-                assets.DATA_18W05,
-                index_col=0,
-                parse_dates=["Order Date", "Ship Date"],
-                engine="pyarrow",
-            )
+def get_sales_matrix():
+    # Years x months; every (years, start_month) pair is summed from it
+    data18w05 = assets.cube.query(
+        assets.DATA_18W05, freq="M", measures=["Sales"]
+    ).reset_index()
+    return data18w05.assign(
+        Year=data18w05["Order Date"].dt.year,
+        Month=data18w05["Order Date"].dt.month,
+    ).pivot(index="Year", columns="Month", values="Sales")
 
-@st.cache_data
 def trans_data(years, start_month):
     if not years:
         return pd.DataFrame()
     
-    data18w05 = load_data()
-    filter_by_year = data18w05["Order Date"].dt.year.isin(years)
-    data18w05_filtered = data18w05.loc[filter_by_year, ["Order Date", "Sales"]]
+    data18w05_matrix = get_sales_matrix()
+    sales = data18w05_matrix.loc[data18w05_matrix.index.isin(years)].sum(min_count=1).dropna()
+    month = sales.index.to_numpy(dtype=np.int32)
 
-    data18w05_transformed = (
-        data18w05_filtered.sort_values(by="Order Date").assign(
-            Month=data18w05_filtered["Order Date"].dt.month,
-            Group_name=data18w05_filtered["Order Date"].apply(
-                convert_month_name, args=(start_month,)
-            ),
-            Month_fullname=data18w05_filtered["Order Date"].apply(
-                convert_month_name, args=(start_month, True)
-            ),
-        )
-        .groupby(by="Group_name")
+    # 0 for the first three months from start_month, 1 for the next three
+    quarter = (month - start_month) % 12 // 3
+    group_name = np.select(
+        [quarter == 0, quarter == 1], ["Q1", "Q2"], np.array(calendar.month_abbr)[month]
+    )
+    data18w05_transformed = pd.DataFrame({
+        "Group_name": group_name,
+        "Sales": sales.to_numpy(),
+        "Month": np.select(
+            [quarter == 0, quarter == 1], [start_month, start_month + 1], month
+        ).astype(np.int32),
+        "Month_fullname": np.select(
+            [quarter == 0, quarter == 1], ["Q1", "Q2"], np.array(calendar.month_name)[month]
+        ),
+    })
+    return (
+        data18w05_transformed.groupby(by="Group_name")
         .agg({"Sales": "sum", "Month": "first", "Month_fullname": "first"})
+        .sort_values(by="Month")
     )
-    return data18w05_transformed.replace({
-            "Month": {
-                data18w05_transformed.loc["Q1", "Month"]: start_month,
-                data18w05_transformed.loc["Q2", "Month"]: start_month+1,
-            }
-        }).sort_values(by="Month")
 
 
 
-@st.cache_data
 def get_figure(years, start_month):
+    return _get_figure(assets.cube.canonical(years), start_month)
+
+@assets.depends_on(assets.DATA_18W05)
+@st.cache_data
+def _get_figure(years, start_month):
     if not years:
         return go.Figure()
     
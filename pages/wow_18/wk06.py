@@ -8,47 +8,77 @@ import streamlit as st
 import assets
 
 
+@assets.depends_on(assets.DATA_18W06)
 @st.cache_data
-def load_data():
-    return pd.read_csv(
-        assets.DATA_18W06,
-        index_col=0,
-        parse_dates=["Order Date", "Ship Date"],
-        engine="pyarrow",
+def get_segment_sales():
+    # Per segment: any selection of segments adds up its rows
+    return assets.cube.query(
+        assets.DATA_18W06, by=["Segment", "Category", "Sub-Category", "Region"],
+        freq=None, measures=["Sales"],
     )
 
 
+@assets.depends_on(assets.DATA_18W06)
 @st.cache_data
+def get_segment_products():
+    return assets.ingest.rollup(assets.DATA_18W06, "segment_products").set_index(
+        ["Segment", "Category", "Sub-Category", "Product Name", "Region"]
+    )
+
+
 def transform_data(*segment):
     if not segment:
         return pd.DataFrame()
     
-    data18w06 = load_data()
-    data18w06_filtered = data18w06.loc[
-        data18w06.Segment.isin(segment), ["Category", "Sub-Category", "Region", "Sales"]
-    ]
-    data18w06_transformed = data18w06_filtered.groupby(
-        by=["Category", "Sub-Category", "Region"]
-    ).sum()
-
-    level0 = data18w06_transformed.index.get_level_values(0)
-    level1 = data18w06_transformed.index.get_level_values(1)
-    level0_sum = [data18w06_transformed.loc[idx].sum().iloc[0] for idx in level0]
-    level1_sum = [
-        data18w06_transformed.loc[idx].sum().iloc[0] for idx in zip(level0, level1)
-    ]
+    data18w06_selected = assets.cube.combine(get_segment_sales(), {"Segment": segment})
+    sums = assets.hierarchy.totals(
+        data18w06_selected.reset_index(), ["Category", "Sub-Category", "Region"], "Sales"
+    )
 
     return (
-        data18w06_transformed.assign(
-            level0_sum=level0_sum,
-            level1_sum=level1_sum,
-        )
+        assets.hierarchy.annotate(sums)
         .sort_values(by=["level0_sum", "level1_sum", "Sales"])
         .reset_index()
     )
 
+
+def product_totals(*segment):
+    return _product_totals(*assets.cube.canonical(segment))
+
+
+@assets.depends_on(assets.DATA_18W06)
 @st.cache_data
+def _product_totals(*segment):
+    # Category > Sub-Category > Product > Region, every level summed once
+    data18w06_selected = assets.cube.combine(get_segment_products(), {"Segment": segment})
+    return assets.hierarchy.totals(
+        data18w06_selected.reset_index(),
+        ["Category", "Sub-Category", "Product Name", "Region"], "Sales",
+    )
+
+
+def drill_down(category, sub_category, *segment):
+    if not segment:
+        return pd.DataFrame()
+
+    sums = product_totals(*segment)
+    products = assets.hierarchy.children(sums, category, sub_category)
+    regions = sums[-1].xs(
+        (category, sub_category), level=["Category", "Sub-Category"]
+    ).unstack("Region", fill_value=0).rename_axis(columns=None)
+    return (
+        regions.assign(Sales=products)
+        .sort_values(by="Sales", ascending=False)
+        .reset_index()
+    )
+
 def plot_figure(*segment):
+    return _plot_figure(*assets.cube.canonical(segment))
+
+
+@assets.depends_on(assets.DATA_18W06)
+@st.cache_data
+def _plot_figure(*segment):
     if not segment:
         return go.Figure()
     
@@ -5,35 +5,34 @@ import streamlit as st
 import assets
 
 
+@assets.depends_on(assets.DATA_18W07)
 @st.cache_data
-def load_data():
-    return pd.read_csv(
+def get_monthly_sales():
+    # Per year and category: any selection of them adds up its rows
+    data18w07 = assets.cube.query(
         assets.DATA_18W07,
-        index_col=0,
-        parse_dates=["Order Date", "Ship Date"],
-        engine="pyarrow",
-    )
+        by=["Category", "Sub-Category"],
+        freq="M",
+        measures=["Sales"],
+    ).reset_index()
+    return data18w07.groupby(
+        by=[
+            data18w07["Order Date"].dt.year.rename("Year"),
+            "Category",
+            "Sub-Category",
+            data18w07["Order Date"].dt.month,
+        ],
+        observed=True,
+    )[["Sales"]].sum()
 
 
-@st.cache_data
 def transform_data(years, category):
     if (not years) or (not category):
         return pd.DataFrame()
 
-    data18w07 = load_data()
-    filter_cond = data18w07["Order Date"].dt.year.isin(years) & data18w07[
-        "Category"
-    ].isin(category)
-
-    data18w07_filtered = data18w07.loc[
-        filter_cond, ["Order Date", "Sub-Category", "Sales"]
-    ]
-    data18w07_transformed = (
-        data18w07_filtered.iloc[:, [1, 2]]
-        .groupby(by=["Sub-Category", data18w07_filtered["Order Date"].dt.month])
-        .sum()
-        .unstack(level=1)
-    )
+    data18w07_transformed = assets.cube.combine(
+        get_monthly_sales(), {"Year": years, "Category": category}
+    ).unstack(level=1)
     data18w07_transformed.columns = data18w07_transformed.columns.droplevel(0)
 
     return data18w07_transformed.assign(
@@ -43,8 +42,13 @@ def transform_data(years, category):
     ).sort_values(by="Grand Total", ascending=False)
 
 
-@st.cache_data
 def get_figure(years, category):
+    return _get_figure(assets.cube.canonical(years), assets.cube.canonical(category))
+
+
+@assets.depends_on(assets.DATA_18W07)
+@st.cache_data
+def _get_figure(years, category):
     if (not years) or (not category):
         return go.Figure()
 
@@ -5,28 +5,29 @@ import streamlit as st
 import assets
 
 
-@st.cache_data
-def load_data() -> pd.DataFrame:
-    return pd.read_csv(assets.DATA_18W08, parse_dates=["year"], engine="pyarrow")
+def resolve(name: str) -> str:
+    # The name as stored, or Rody for names there is no data for
+    _, name_rows = assets.datasets.partitioned(assets.DATA_18W08, "name")
+    return name.title() if name.title() in name_rows else "Rody"
 
 
-@st.cache_data
 def transform_data(name: str) -> tuple[bool, pd.DataFrame]:
-    data18w08 = load_data()
-    filter_name = data18w08["name"] == name.title()
-    name_found = any(filter_name)
-    if not name_found:
-        filter_name = data18w08["name"] == "Rody"
-        name = "Rody"
+    # One shared name index instead of one cached frame per search string
+    data18w08, name_rows = assets.datasets.partitioned(assets.DATA_18W08, "name")
+    name_found = name.title() in name_rows
 
-    return name_found, data18w08.loc[filter_name, ["year", "sex", "name", "n"]]
+    return name_found, data18w08.iloc[name_rows[resolve(name)]].loc[:, ["year", "sex", "name", "n"]]
 
 
-@st.cache_data
 def get_figure(name: str) -> go.Figure:
-    name_found, data18w08_filtered = transform_data(name)
-    if not name_found:
-        name = "Rody"
+    # Every spelling of a name, and every unknown name, share one figure
+    return _get_figure(resolve(name))
+
+
+@assets.depends_on(assets.DATA_18W08)
+@st.cache_data
+def _get_figure(name: str) -> go.Figure:
+    data18w08_filtered = transform_data(name)[1]
     sexMap = {"M": ("Male", "#F3D744"), "F": ("Female", "#87D6BD")}
 
     fig = go.Figure()
@@ -81,7 +82,7 @@ def get_figure(name: str) -> go.Figure:
         )
 
     title = dict(
-        text=f"Births by year in U.S.<br><b><span style='font-size: 20px'>{name.title()}</span></b>",
+        text=f"Births by year in U.S.<br><b><span style='font-size: 20px'>{name}</span></b>",
         x=0.5,
         xref="paper",
         xanchor="center",
@@ -4,13 +4,15 @@ from datetime import datetime
 import streamlit as st
 import assets
 
+@assets.depends_on(assets.DATA_18W09)
 @st.cache_data
 def load_data() -> pd.DataFrame:
-    data18w09 = pd.read_csv(assets.DATA_18W09, parse_dates=["Year"], engine="pyarrow")
+    data18w09 = assets.load(assets.DATA_18W09)
     return data18w09.assign(
         Percentage_of_Players=data18w09["% of Players"].str.rstrip("%").astype(float) / 100.0
     )
 
+@assets.depends_on(assets.DATA_18W09)
 @st.cache_data
 def get_figure() -> go.Figure:
     data18w09 = load_data()
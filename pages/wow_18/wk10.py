@@ -4,7 +4,6 @@ from datetime import datetime
 import plotly.graph_objects as go
 
 # Data manipulation
-import pandas as pd
 import numpy as np
 
 # Streamlit
@@ -14,113 +13,94 @@ import streamlit as st
 import assets
 
 
-@st.cache_data
-def load_data():
-    return pd.read_csv(
-        assets.DATA_18W10,
-        index_col=0,
-        parse_dates=["Order Date", "Ship Date"],
-        engine="pyarrow",
-    )
+# Segments from the inside of a spoke outwards
+SEGMENTS = ["Corporate", "Consumer", "Home Office"]
 
+SPOKES = {
+    # Number of every date's spoke in 2017 and spokes in the year
+    "Week": (lambda dates: dates.dt.to_period("W").dt.week, 52),
+    "Day": (lambda dates: dates.dt.dayofyear.astype(np.int64), 365),
+}
 
+
+@assets.depends_on(assets.DATA_18W10)
 @st.cache_data
-def transform_data():
-    data18w10 = load_data()
-    data18w10_filtered = data18w10.loc[
-        data18w10["Order Date"].dt.year == 2017, ["Order Date", "Segment", "Sales"]
-    ].sort_values(by="Order Date")
-    data18w10_transformed = (
-        data18w10_filtered.assign(
-            Week=data18w10_filtered["Order Date"]
-            .dt.to_period("W")
-            .apply(lambda x: x.week)
-        )
-        .loc[data18w10_filtered["Order Date"] != datetime(2017, 1, 1)]
-        .groupby(by=["Week", "Segment"])
-        .sum(numeric_only=True)
-    )
-    data18w10_calculated = pd.concat(
-        [
-            data18w10_transformed,
-            data18w10_transformed.groupby(level=0, group_keys=False)
-            .apply(lambda x: x / x.sum())
-            .rename(columns={"Sales": "Sales_percent"}),
-        ],
-        axis=1,
-    ).assign(
-        angle=[
-            2 * np.pi * (i - 1) / 52
-            for i in data18w10_transformed.index.get_level_values(0)
+def transform_data(spoke="Week", inner_radii=1, segment_gap=0.15):
+    data18w10_filtered = assets.cube.query(
+        assets.DATA_18W10,
+        by=["Segment"],
+        start=datetime(2017, 1, 1),
+        end=datetime(2017, 12, 31),
+        measures=["Sales"],
+    ).reset_index()
+    if spoke == "Week":
+        # 2017-01-01 closes the last week of 2016
+        data18w10_filtered = data18w10_filtered.loc[
+            data18w10_filtered["Order Date"] != datetime(2017, 1, 1)
         ]
+    number, n_spokes = SPOKES[spoke]
+    data18w10_transformed = (
+        data18w10_filtered.assign(**{spoke: number(data18w10_filtered["Order Date"])})
+        .groupby(by=[spoke, "Segment"], observed=True)[["Sales"]]
+        .sum()
     )
 
-    def calc_r(df, week, inner_radii=1, segment_gap=0.15):
-        df.loc[(week, "Corporate"), "r1"] = inner_radii
-        df.loc[(week, "Corporate"), "r2"] = (
-            df.loc[(week, "Corporate"), "r1"]
-            + df.loc[(week, "Corporate"), "Sales_percent"]
-        )
-        df.loc[(week, "Consumer"), "r1"] = (
-            df.loc[(week, "Corporate"), "r2"] + segment_gap
-        )
-        df.loc[(week, "Consumer"), "r2"] = (
-            df.loc[(week, "Consumer"), "r1"]
-            + df.loc[(week, "Consumer"), "Sales_percent"]
-        )
-        df.loc[(week, "Home Office"), "r1"] = (
-            df.loc[(week, "Consumer"), "r2"] + segment_gap
-        )
-        df.loc[(week, "Home Office"), "r2"] = (
-            df.loc[(week, "Home Office"), "r1"]
-            + df.loc[(week, "Home Office"), "Sales_percent"]
-        )
+    sales = data18w10_transformed["Sales"]
+    sales_percent = sales / sales.groupby(level=0).transform("sum")
 
-    for i in data18w10_calculated.index.get_level_values(0).unique():
-        calc_r(data18w10_calculated, i)
+    # Spokes x segments: every segment starts a gap after the one inside it
+    stacked = sales_percent.unstack("Segment")[SEGMENTS]
+    r2 = inner_radii + stacked.cumsum(axis=1) + segment_gap * np.arange(len(SEGMENTS))
+    r1 = r2 - stacked
 
-    return data18w10_calculated
+    spokes = data18w10_transformed.index.get_level_values(0).to_numpy()
+    return data18w10_transformed.assign(
+        Sales_percent=sales_percent,
+        angle=2 * np.pi * (spokes - 1) / n_spokes,
+        r1=r1.stack().reindex(data18w10_transformed.index),
+        r2=r2.stack().reindex(data18w10_transformed.index),
+    )
 
 
+@assets.depends_on(assets.DATA_18W10)
 @st.cache_data
-def get_figure():
-    data18w10_calculated = transform_data()
+def get_figure(spoke="Week"):
+    data18w10_calculated = transform_data(spoke)
     width, height = 600, 600
-    cm = dict(
-        zip(["Corporate", "Consumer", "Home Office"], ["#E84D5B", "#6FB899", "#26979F"])
-    )
+    cm = dict(zip(SEGMENTS, ["#E84D5B", "#6FB899", "#26979F"]))
     BGCOLOR = "#EAE2CF"
+    line_width = 6 * min(1, 52 / SPOKES[spoke][1])
 
     fig = go.Figure()
 
-    for week in data18w10_calculated.index.get_level_values(0).unique():
-        for segment in ["Corporate", "Consumer", "Home Office"]:
-            r = np.array(data18w10_calculated.loc[(week, segment), ["r1", "r2"]])
-            angle = data18w10_calculated.loc[(week, segment), "angle"]
-            fig.add_trace(
-                go.Scatter(
-                    name=segment,
-                    mode="lines+markers",
-                    meta=[
-                        data18w10_calculated.loc[(week, segment), "Sales"],
-                        segment,
-                        week,
-                    ],
-                    x=r * np.sin(angle),
-                    y=r * np.cos(angle),
-                    line=dict(
-                        color=cm[segment],
-                        width=6,
-                    ),
-                    marker=dict(
-                        symbol="circle",
-                        size=6,
-                    ),
-                    showlegend=week == 1,
-                    legendgroup=segment,
-                    hovertemplate="Salse: %{meta[0]:$,.0f}<br>%{meta[1]}<br>Week %{meta[2]}<extra></extra>",
-                )
+    for segment in SEGMENTS:
+        data = data18w10_calculated.xs(segment, level="Segment")
+        # One trace per segment: a line per spoke, NaN in between
+        r = np.column_stack([data["r1"], data["r2"], np.full(len(data), np.nan)]).ravel()
+        angle = np.repeat(data["angle"].to_numpy(), 3)
+        fig.add_trace(
+            go.Scatter(
+                name=segment,
+                mode="lines+markers",
+                customdata=np.repeat(
+                    np.column_stack([data["Sales"], data.index.to_numpy()]), 3, axis=0
+                ),
+                x=r * np.sin(angle),
+                y=r * np.cos(angle),
+                line=dict(
+                    color=cm[segment],
+                    width=line_width,
+                ),
+                marker=dict(
+                    symbol="circle",
+                    size=line_width,
+                ),
+                hovertemplate=(
+                    f"Sales: %{{customdata[0]:$,.0f}}<br>{segment}<br>"
+                    f"{spoke} %{{customdata[1]}}<extra></extra>"
+                ),
             )
+        )
 
     fig.add_annotation(
         text="#WOW 2018, Week 10",
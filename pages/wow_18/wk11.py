@@ -6,29 +6,21 @@ import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 
 # Data manipulation
-import pandas as pd
 import numpy as np
 
 # Resources
 import assets
 
 
-@st.cache_data
-def load_data():
-    return pd.read_csv(
-        assets.DATA_18W11,
-        index_col=0,
-        parse_dates=["Order Date", "Ship Date"],
-        engine="pyarrow",
-    )
-
-
+@assets.depends_on(assets.DATA_18W11)
 @st.cache_data
 def transform_data():
-    data18w11 = load_data()
+    data18w11 = assets.cube.query(
+        assets.DATA_18W11, by=["Category", "Sub-Category"], freq=None, measures=["Sales"]
+    ).reset_index()
     sales_office_supplies = (
         data18w11.query("Category=='Office Supplies'")[["Sub-Category", "Sales"]]
-        .groupby(by="Sub-Category")
+        .groupby(by="Sub-Category", observed=True)
         .sum()
     )
     percent_sales_office_supplies = sales_office_supplies / sales_office_supplies.sum()
@@ -39,6 +31,7 @@ def transform_data():
     )
 
 
+@assets.depends_on(assets.DATA_18W11)
 @st.cache_data
 def get_figure():
     X, Y = np.meshgrid(np.arange(0, 20), np.arange(0, 5))
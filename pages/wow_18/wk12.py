@@ -8,56 +8,43 @@ from pandas.tseries.offsets import DateOffset
 # Resources
 import assets
 
-@st.cache_data
-def load_data():
-    return pd.read_csv(
-        assets.DATA_18W12,
-        index_col=0,
-        parse_dates=["Order Date", "Ship Date"],
-        engine="pyarrow",
-    )
-
-@st.cache_data
 def get_last_two_periods(current_max_date):
-    data18w12 = load_data()
-    most_recent = (data18w12["Order Date"]<=current_max_date) & (data18w12["Order Date"]>=current_max_date.replace(day=1))
     prior_month = current_max_date - DateOffset(months=1)
-    prior = (data18w12["Order Date"]<=prior_month) & (data18w12["Order Date"]>=prior_month.replace(day=1))
+    most_recent = (current_max_date.replace(day=1), current_max_date)
+    prior = (prior_month.replace(day=1), prior_month)
     return most_recent, prior
 
+@assets.depends_on(assets.DATA_18W12)
 @st.cache_data
+def get_running_sales():
+    # Built once: every slider date is then answered by lookups into it
+    return assets.cube.running_totals(assets.DATA_18W12, "Sub-Category", "Sales")
+
 def get_last_two_periods_format(current_max_date):
-    data18w12 = load_data()
-    most_recent, prior = get_last_two_periods(current_max_date)
-    if most_recent.sum() == 0:
-        most_recent_format = ""
-    else:
-        start, end = data18w12.loc[most_recent, "Order Date"].min(), data18w12.loc[most_recent, "Order Date"].max()
-        most_recent_format = start.strftime("%Y/%m/%d")+" - "+end.strftime("%Y/%m/%d")
-    if prior.sum() == 0:
-        prior_format = ""
-    else:
-        start_prior, end_prior = data18w12.loc[prior, "Order Date"].min(), data18w12.loc[prior, "Order Date"].max()
-        prior_format = start_prior.strftime("%Y/%m/%d")+" - "+end_prior.strftime("%Y/%m/%d")
-    return most_recent_format, prior_format 
+    order_dates = get_running_sales().index
+    periods_format = []
+    for start, end in get_last_two_periods(current_max_date):
+        window = assets.datasets.date_window(order_dates, start, end)
+        if window.start >= window.stop:
+            periods_format.append("")
+        else:
+            periods_format.append(order_dates[window.start].strftime("%Y/%m/%d")+" - "+order_dates[window.stop - 1].strftime("%Y/%m/%d"))
+    return tuple(periods_format)
 
-@st.cache_data
 def transform_data(current_max_date):
-    data18w12 = load_data()
     most_recent, prior = get_last_two_periods(current_max_date)
-
-    data18w12_most_recent = data18w12.loc[most_recent, ["Sub-Category", "Sales"]]
-    data18w12_prior = data18w12.loc[prior, ["Sub-Category", "Sales"]]
+    data18w12_running = get_running_sales()
 
     data18w12_transformed = pd.concat([
-        data18w12_most_recent.groupby(by="Sub-Category").sum().rename(columns={"Sales": "Most Recent Month"}),
-        data18w12_prior.groupby(by="Sub-Category").sum().rename(columns={"Sales": "Prior Month"}),
+        assets.cube.window_totals(data18w12_running, *most_recent).rename("Most Recent Month"),
+        assets.cube.window_totals(data18w12_running, *prior).rename("Prior Month"),
     ], axis=1)
 
     return data18w12_transformed.assign(
         Change=(data18w12_transformed['Most Recent Month'] - data18w12_transformed["Prior Month"]) / data18w12_transformed["Prior Month"]
     ).fillna({"Change": 0}).sort_values(by="Change", ascending=False)
 
+@assets.depends_on(assets.DATA_18W12)
 @st.cache_data
 def get_figure(current_max_date):
     data18w12_transformed = transform_data(current_max_date)
@@ -12,93 +12,64 @@ import numpy as np
 import assets
 
 
-@st.cache_data
-def load_data():
-    return pd.read_csv(
-        assets.DATA_18W13,
-        index_col=0,
-        parse_dates=["Order Date", "Ship Date"],
-        engine="pyarrow",
-    )
+MEASURES = ["Sales", "% of Total", "% Diff"]
+CELL_COLOR = "#EBF0F8"
+# Sales cells take one of 201 colours along the scale
+SALES_COLORS = np.array(sample_colorscale("RdBu", 201), dtype=object)
 
 
+@assets.depends_on(assets.DATA_18W13)
 @st.cache_data
-def transform_data(year, measure):
-    data18w13 = load_data()
-    data18w13_transformed = (
-        data18w13.loc[:, ["Sub-Category", "Sales"]]
-        .groupby(by=["Sub-Category", data18w13["Order Date"].dt.year])
+def get_measures():
+    # Sub-categories x years x measures, flattened to (year, measure) columns
+    data18w13 = assets.cube.query(
+        assets.DATA_18W13, by=["Sub-Category"], freq="Y", measures=["Sales"]
+    ).reset_index()
+    data18w13_sales = (
+        data18w13.groupby(by=["Sub-Category", data18w13["Order Date"].dt.year], observed=True)["Sales"]
         .sum()
         .unstack()
-        .swaplevel(axis=1)
     )
 
-    for y in [2014, 2015, 2016, 2017]:
-        data18w13_transformed.loc[:, (y, "% of Total")] = (
-            data18w13_transformed.loc[:, (y, "Sales")]
-            / data18w13_transformed.loc[:, (y, "Sales")].sum()
-        )
-        if y != 2014:
-            data18w13_transformed.loc[:, (y, "% Diff")] = (
-                data18w13_transformed.loc[:, (y, "Sales")]
-                - data18w13_transformed.loc[:, (y - 1, "Sales")]
-            ) / data18w13_transformed.loc[:, (y - 1, "Sales")]
-        else:
-            data18w13_transformed.loc[:, (y, "% Diff")] = np.nan
+    sales = data18w13_sales.to_numpy()
+    percent_diff = np.full(sales.shape, np.nan)
+    percent_diff[:, 1:] = np.diff(sales, axis=1) / sales[:, :-1]
+    measures = np.stack([sales, sales / np.nansum(sales, axis=0), percent_diff], axis=2)
 
-    return data18w13_transformed.sort_index(
-        axis=1,
-        key=lambda idx: [
-            {"Sales": 0, "% of Total": 1, "% Difference": 2}.get(x, x) for x in idx
-        ],
-    ).sort_values(by=[(year, measure)], ascending=False)
+    return pd.DataFrame(
+        measures.reshape(len(sales), -1),
+        index=data18w13_sales.index,
+        columns=pd.MultiIndex.from_product(
+            [data18w13_sales.columns, MEASURES], names=["Order Date", None]
+        ),
+    )
 
 
-def get_colors(value, minvalue, maxvalue, cm="RdBu"):
-    colors = sample_colorscale(cm, 201)
-    n = int((value - minvalue) / (maxvalue - minvalue) * 200)
-    return colors[n]
+def transform_data(year, measure):
+    return get_measures().sort_values(by=[(year, measure)], ascending=False)
 
 
+@assets.depends_on(assets.DATA_18W13)
 @st.cache_data
 def get_figure(year, measure):
     data18w13_transformed = transform_data(year, measure)
-    maxSales = data18w13_transformed.max().max()
-    minSales = data18w13_transformed.min().min()
-    saleColors = np.array(
-        [
-            ["#EBF0F8"] * len(data18w13_transformed),
-            [
-                get_colors(v, minSales, maxSales)
-                for v in data18w13_transformed.loc[:, (2014, "Sales")]
-            ],
-            ["#EBF0F8"] * len(data18w13_transformed),
-            ["#EBF0F8"] * len(data18w13_transformed),
-            [
-                get_colors(v, minSales, maxSales)
-                for v in data18w13_transformed.loc[:, (2015, "Sales")]
-            ],
-            ["#EBF0F8"] * len(data18w13_transformed),
-            ["#EBF0F8"] * len(data18w13_transformed),
-            [
-                get_colors(v, minSales, maxSales)
-                for v in data18w13_transformed.loc[:, (2016, "Sales")]
-            ],
-            ["#EBF0F8"] * len(data18w13_transformed),
-            ["#EBF0F8"] * len(data18w13_transformed),
-            [
-                get_colors(v, minSales, maxSales)
-                for v in data18w13_transformed.loc[:, (2017, "Sales")]
-            ],
-            ["#EBF0F8"] * len(data18w13_transformed),
-            ["#EBF0F8"] * len(data18w13_transformed),
-        ]
-    )
+    years = data18w13_transformed.columns.get_level_values(0).unique()
+    sales = data18w13_transformed.xs("Sales", axis=1, level=1).to_numpy()
+
+    # Colour scale from the smallest to the largest value of the table
+    minValue = np.nanmin(data18w13_transformed.to_numpy())
+    maxValue = np.nanmax(data18w13_transformed.to_numpy())
+    saleColors = np.full((1 + len(MEASURES) * len(years), len(sales)), CELL_COLOR, dtype=object)
+    saleColors[1::len(MEASURES)] = SALES_COLORS[
+        ((sales - minValue) / (maxValue - minValue) * 200).astype(int)
+    ].T
+    fontColors = np.where((sales > 90000) | (sales < 22000), "white", "black").T
+
     fig = go.Figure()
 
     fig.add_trace(
         go.Table(
-            columnwidth=[7] + [6, 7, 6] * 4,
+            columnwidth=[7] + [6, 7, 6] * len(years),
             header=dict(
                 values=[("", "Sub-Category")] + list(data18w13_transformed.columns),
                 align="center",
@@ -111,44 +82,12 @@ def get_figure(year, measure):
                     for col in data18w13_transformed.columns
                 ],
                 align=["left", "right"],
-                format=[""] + ["$,.0f", ".2%", ".2%"] * 4,
+                format=[""] + ["$,.0f", ".2%", ".2%"] * len(years),
                 height=30,
                 fill_color=saleColors,
-                font_color=(
-                    ["black"]
-                    + [
-                        [
-                            "white" if (v > 90000 or v < 22000) else "black"
-                            for v in data18w13_transformed.loc[:, (2014, "Sales")]
-                        ],
-                        "black",
-                        "black",
-                    ]
-                    + [
-                        [
-                            "white" if (v > 90000 or v < 22000) else "black"
-                            for v in data18w13_transformed.loc[:, (2015, "Sales")]
-                        ],
-                        "black",
-                        "black",
-                    ]
-                    + [
-                        [
-                            "white" if (v > 90000 or v < 22000) else "black"
-                            for v in data18w13_transformed.loc[:, (2016, "Sales")]
-                        ],
-                        "black",
-                        "black",
-                    ]
-                    + [
-                        [
-                            "white" if (v > 90000 or v < 22000) else "black"
-                            for v in data18w13_transformed.loc[:, (2017, "Sales")]
-                        ],
-                        "black",
-                        "black",
-                    ]
-                ),
+                font_color=["black"] + [
+                    color for colors in fontColors for color in (colors.tolist(), "black", "black")
+                ],
             ),
         )
     )
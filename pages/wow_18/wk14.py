@@ -10,47 +10,30 @@ import numpy as np
 # Resources
 import assets
 
-@st.cache_data
-def load_data():
-    return pd.read_csv(
-        assets.DATA_18W14,
-        index_col=0,
-        parse_dates=["Order Date", "Ship Date"],
-        engine="pyarrow",
-    )
-
+@assets.depends_on(assets.DATA_18W14)
 @st.cache_data
 def calculate_data():
-    data18w14 = load_data()
-    
-    data18w14_grouped = data18w14.loc[:, ["Order ID", "Sub-Category", "Sales"]].groupby(
-        by=["Sub-Category", "Order ID"],
-    ).sum()
-
-    sub_categories = data18w14["Sub-Category"].unique()
-
-    data = []
-    for cat1 in sub_categories:
-        for cat2 in sub_categories:
-            if cat1 == cat2:
-                tmp = data18w14_grouped.loc[cat1, :]
-                avg = tmp.mean().iloc[0]
-                data.append({"sub-cat1": cat1, "sub-cat2": cat2, "count-cat": len(tmp), "avg-cat1": avg, "avg-cat2": avg})
-            else:
-                tmp1 = data18w14_grouped.loc[cat1, :]
-                tmp2 = data18w14_grouped.loc[cat2, :]
-                tmp = tmp1.merge(tmp2, how="inner", left_index=True, right_index=True)
-                avgs = tmp.mean()
-                freq = len(tmp)
-                data.append({"sub-cat1": cat1, "sub-cat2": cat2, "count-cat": freq, "avg-cat1": avgs.iloc[0], "avg-cat2": avgs.iloc[1]})
-
-    data18w14_calculated = pd.DataFrame(data).set_index(
-        ["sub-cat1", "sub-cat2"],
-    )
-    return data18w14_calculated.sort_index(
-        key=lambda idx: [data18w14_calculated.loc[(r, r), "count-cat"] for r in idx]
-    ).reset_index()
-
+    data18w14 = assets.ingest.rollup(assets.DATA_18W14, "order_subcategories")
+    pairs = assets.basket.pairs(data18w14, "Order ID", "Sub-Category", "Sales").set_index(["item1", "item2"])
+
+    sub_categories = data18w14["Sub-Category"].unique().tolist()
+    grid = pd.MultiIndex.from_product([sub_categories, sub_categories], names=["sub-cat1", "sub-cat2"])
+    pairs = pairs.reindex(grid)
+
+    data18w14_calculated = pd.DataFrame({
+        "count-cat": pairs["count"].fillna(0).astype(int),
+        "avg-cat1": pairs["value1"] / pairs["count"],
+        "avg-cat2": pairs["value2"] / pairs["count"],
+    }).reset_index()
+
+    # Most frequent sub-categories last, on both axes
+    orders = data18w14["Sub-Category"].value_counts()
+    return data18w14_calculated.iloc[np.lexsort((
+        data18w14_calculated["sub-cat2"].map(orders),
+        data18w14_calculated["sub-cat1"].map(orders),
+    ))].reset_index(drop=True)
+
+@assets.depends_on(assets.DATA_18W14)
 @st.cache_data
 def get_figure():
     data18w14_calculated = calculate_data()
@@ -178,4 +161,82 @@ def get_figure():
         )
     )
 
-    return fig
\ No newline at end of file
+    return fig
+
+# Product level: only the strongest pairs of every product are kept
+@assets.depends_on(assets.DATA_18W14)
+@st.cache_data
+def calculate_product_pairs(top_k=5, min_support=0.0):
+    data18w14 = assets.ingest.rollup(assets.DATA_18W14, "order_products")
+    names = assets.ingest.rollup(assets.DATA_18W14, "product_names").set_index("Product ID")["Product Name"]
+    pairs = assets.basket.top_pairs(
+        data18w14, "Order ID", "Product ID", "Sales", k=top_k, min_support=min_support
+    )
+
+    return pd.DataFrame({
+        "product1": pairs["item1"].astype(str),
+        "product2": pairs["item2"].astype(str),
+        "name1": names.reindex(pairs["item1"]).to_numpy(),
+        "name2": names.reindex(pairs["item2"]).to_numpy(),
+        "rank": pairs["rank"],
+        "count-prod": pairs["count"],
+        "support": pairs["support"],
+        "avg-prod1": pairs["value1"] / pairs["count"],
+        "avg-prod2": pairs["value2"] / pairs["count"],
+    })
+
+@assets.depends_on(assets.DATA_18W14)
+@st.cache_data
+def get_product_figure(top_k=5, min_support=0.0, products=30):
+    data18w14_pairs = calculate_product_pairs(top_k, min_support)
+
+    # The products with the most co-purchases and the pairs among them
+    shown = data18w14_pairs.groupby(by="product1")["count-prod"].sum().nlargest(products).index
+    plot_data = data18w14_pairs.loc[
+        data18w14_pairs["product1"].isin(shown) & data18w14_pairs["product2"].isin(shown), :
+    ]
+    labelalias = dict(zip(data18w14_pairs["product1"], data18w14_pairs["name1"].str.slice(0, 30)))
+
+    fig = go.Figure(go.Heatmap(
+        x=plot_data["product1"],
+        y=plot_data["product2"],
+        z=plot_data["count-prod"],
+        colorscale=[[0, "#D9D9D9"], [1, "#B36CC1"]],
+        xgap=1.5, ygap=1.5,
+        customdata=plot_data[["name1", "name2", "avg-prod1", "avg-prod2", "rank"]],
+        hovertemplate=("<b>%{z:,.0f}</b> unique orders included <b>%{customdata[0]} & %{customdata[1]}</b><br><br>"
+                    "Average sales per order<br>"
+                    "%{customdata[0]}: <b>%{customdata[2]:$,.2f}</b><br>"
+                    "%{customdata[1]}: <b>%{customdata[3]:$,.2f}</b><br>"
+                    "Rank among the partners of %{customdata[0]}: <b>%{customdata[4]}</b><extra></extra>"
+        ),
+        hoverlabel=dict(
+            bgcolor="white",
+            align="left",
+        ),
+        showscale=False,
+        hoverongaps=False,
+    ))
+
+    fig.update_layout(
+        width=1000, height=900,
+        plot_bgcolor="white",
+        yaxis=dict(
+            labelalias=labelalias,
+            showgrid=False,
+            ticks="",
+        ),
+        xaxis=dict(
+            labelalias=labelalias,
+            autorange="reversed",
+            side="top",
+            tickangle=-90,
+            showgrid=False,
+            ticks="",
+        ),
+        margin=dict(
+            r=30, b=30
+        )
+    )
+
+    return fig
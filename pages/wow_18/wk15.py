@@ -6,37 +6,43 @@ from plotly.subplots import make_subplots
 import streamlit as st
 
 # Data manipulation
-import pandas as pd
+import numpy as np
 
 # Resources
 import assets
 
+@assets.depends_on(assets.DATA_18W15)
 @st.cache_data
-def load_data():
-    return pd.read_csv(
-        assets.DATA_18W15,
-        index_col=0,
-        parse_dates=["Order Date", "Ship Date"],
-        engine="pyarrow",
-    )
+def transform_data():
+    data18w15 = assets.ingest.rollup(assets.DATA_18W15, 'products')
+    # Sub-categories with the fewest products first, products by first order
+    products = data18w15['Sub-Category'].map(data18w15['Sub-Category'].value_counts())
+    return data18w15.iloc[np.lexsort((
+        data18w15['Order Date'], data18w15['Sub-Category'].cat.codes, products
+    ))]
 
 
-def sort_func(col):
-    if pd.api.types.is_object_dtype(col):
-        return pd.Series([(col==item).sum() for item in col])
-    else:
-        return col
+def waffle(data, width=10, block=100):
+    # Rows of every sub-category laid out in order, `width` dots a line and
+    # a blank line after every `block` dots
+    index = data.groupby(by='Sub-Category', observed=True, sort=False).cumcount().to_numpy()
+    return data.assign(
+        x=index % width,
+        y=index // width + index // block,
+        block=index // block,
+    )
 
-@st.cache_data
-def transform_data():
-    data18w15 = load_data()
-    return data18w15.loc[:, ['Sub-Category', 'Product Name', 'Order Date', 'Sales']].groupby(
-        by=['Sub-Category', 'Product Name']
-    ).agg({'Order Date': 'min', 'Sales': 'sum'}).reset_index().sort_values(
-        by=['Sub-Category', 'Order Date'], key=sort_func
+
+def discrete_colorscale(colors):
+    # Marker colour i is drawn in colors[i]: numbers validate far faster than
+    # one colour string per dot
+    return dict(
+        colorscale=[[i / (len(colors) - 1), color] for i, color in enumerate(colors)],
+        cmin=0, cmax=len(colors) - 1,
     )
 
 # Intermediate
+@assets.depends_on(assets.DATA_18W15)
 @st.cache_data
 def get_intermediate_figure():
     data18w15_transformed = transform_data()
@@ -44,6 +50,11 @@ def get_intermediate_figure():
     top5 = data18w15_transformed['Sub-Category'].unique()[-5:]
     colors = ['#9E3A26', '#CF4F22', '#F49538']
 
+    top5_by_sales = data18w15_transformed.loc[
+        data18w15_transformed['Sub-Category'].isin(top5), :
+    ].sort_values(by=['Sub-Category', 'Sales'], ascending=[True, False], kind='stable')
+    top5_with_coords = dict(tuple(waffle(top5_by_sales).groupby(by='Sub-Category', observed=True)))
+
     fig = make_subplots(
         rows=1, cols=5,
         shared_yaxes=True,
@@ -51,14 +62,9 @@ def get_intermediate_figure():
     )
 
     for i, subcat in enumerate(top5):
-        sub_cat = data18w15_transformed.query("`Sub-Category`==@subcat").sort_values(
-            by='Sales', ascending=False).reset_index(drop=True)
-
-        group_offset = sub_cat.index // 10 // 10
+        sub_cat = top5_with_coords[subcat]
         sub_cat_with_coords = sub_cat.assign(
-            x=sub_cat.index % 10,
-            y=sub_cat.index // 10 + group_offset,
-            color=[colors[i] for i in group_offset],
+            color=np.minimum(sub_cat['block'], len(colors) - 1),
         )
 
         fig.add_trace(go.Scatter(
@@ -67,6 +73,7 @@ def get_intermediate_figure():
             y=sub_cat_with_coords['y'],
             marker=dict(
                 color=sub_cat_with_coords['color'],
+                **discrete_colorscale(colors),
                 size=8,
             ),
             showlegend=False,
@@ -82,7 +89,7 @@ def get_intermediate_figure():
             f"yaxis{5-i if i < 4 else ''}": dict(
                 showgrid=False,
                 zeroline=False,
-                range=[-1, 32],
+                range=[-1, max(32, sub_cat_with_coords['y'].max() + 1)],
                 showticklabels=False,
                 scaleratio=2,
             ),
@@ -134,10 +141,12 @@ def get_intermediate_figure():
 
 
 # Jedi
+@assets.depends_on(assets.DATA_18W15)
 @st.cache_data
 def get_jedi_figure():
     data18w15_transformed = transform_data()
     sub_cats = data18w15_transformed['Sub-Category'].unique()[::-1]
+    sub_cats_with_coords = dict(tuple(waffle(data18w15_transformed).groupby(by='Sub-Category', observed=True)))
     colors = {2014: '#4E9F50', 2015: '#87D180', 2016: '#F7D42A', 2017: '#EF8A0C'}
     icons = {
         "Paper": "📝",
@@ -167,13 +176,9 @@ def get_jedi_figure():
     )
 
     for i, subcat in enumerate(sub_cats):
-        sub_cat = data18w15_transformed.query("`Sub-Category`==@subcat").reset_index(drop=True)
-
-        group_offset = sub_cat.index // 10 // 10
+        sub_cat = sub_cats_with_coords[subcat]
         sub_cat_with_coords = sub_cat.assign(
-            x=sub_cat.index % 10,
-            y=sub_cat.index // 10 + group_offset,
-            color=[colors[key.year] for key in sub_cat["Order Date"]],
+            color=np.clip(sub_cat["Order Date"].dt.year - min(colors), 0, len(colors) - 1),
         )
 
         row = i // 5 + 1
@@ -184,6 +189,7 @@ def get_jedi_figure():
             y=sub_cat_with_coords['y'],
             marker=dict(
                 color=sub_cat_with_coords['color'],
+                **discrete_colorscale(list(colors.values())),
                 size=5,
             ),
             showlegend=False,
@@ -199,7 +205,7 @@ def get_jedi_figure():
             f"yaxis{i+1 if i>0 else ''}": dict(
                 showgrid=False,
                 zeroline=False,
-                range=[-1, 40],
+                range=[-1, max(40, sub_cat_with_coords['y'].max() + 1)],
                 showticklabels=False,
                 scaleratio=2,
             ),
@@ -13,15 +13,6 @@ import numpy as np
 # Resources
 import assets
 
-@st.cache_data
-def load_data():
-    return pd.read_csv(
-        assets.DATA_18W16,
-        index_col=0,
-        parse_dates=["Order Date", "Ship Date"],
-        engine="pyarrow",
-    )
-
 colorUp, colorDown = "#4E79A7", "#D3480D"
 
 def get_period(end_date: datetime, period_type: str, period_numbers: int):
@@ -34,22 +25,27 @@ def get_period(end_date: datetime, period_type: str, period_numbers: int):
     elif period_type == "Month":
         return periods[0].replace(day=1), periods[-1]
 
+def year_earlier(date):
+    # February 29 falls back to February 28
+    if date.month == 2 and date.day == 29:
+        return date.replace(year=date.year-1, day=28)
+    return date.replace(year=date.year-1)
+
+@assets.depends_on(assets.DATA_18W16)
 @st.cache_data
+def get_running_sales():
+    # Built once: every window is then two lookups per sub-category
+    return assets.cube.running_totals(assets.DATA_18W16, "Sub-Category", "Sales")
+
 def transform_data(end_date, period_type, period_numbers):
     start, end = get_period(end_date, period_type, period_numbers)
+    data18w16_running = get_running_sales()
 
-    data18w16 = load_data()
-
-    filter_cond = (data18w16["Order Date"]>=start) & (data18w16["Order Date"]<=end)
-
-    sales_last_n = data18w16.loc[filter_cond, ["Sub-Category", "Sales"]].groupby(
-        by="Sub-Category").sum().sort_values(by="Sales")
-
-    filter_previous_cond = ((data18w16["Order Date"]>=start.replace(year=start.year-1)) & 
-                            (data18w16["Order Date"]<=end.replace(year=end.year-1)))
+    sales_last_n = assets.cube.window_totals(
+        data18w16_running, start, end).sort_values().rename("Sales")
 
-    sales_last_n_previous = data18w16.loc[filter_previous_cond, ["Sub-Category", "Sales"]].groupby(
-        by="Sub-Category").sum().sort_values(by="Sales").rename(columns={"Sales": "Sales_pre"})
+    sales_last_n_previous = assets.cube.window_totals(
+        data18w16_running, year_earlier(start), year_earlier(end)).sort_values().rename("Sales_pre")
 
     sales_compare = pd.concat([sales_last_n, sales_last_n_previous], axis=1).fillna(0)
 
@@ -61,6 +57,7 @@ def transform_data(end_date, period_type, period_numbers):
                 (sales_compare["Sales"] - sales_compare["Sales_pre"])<0, f"<span style='color:{colorDown}'>▼</span>", "")),
     ).sort_values(by="Sales")
 
+@assets.depends_on(assets.DATA_18W16)
 @st.cache_data
 def get_figure(end_date, period_type, period_numbers):
     sales_compare = transform_data(end_date, period_type, period_numbers)
@@ -9,31 +9,23 @@ from plotly.colors import sample_colorscale
 
 import streamlit as st
 
-# Data manipulation
-import pandas as pd
-
 # Resources
 import assets
 
-@st.cache_data
-def load_data():
-    return pd.read_csv(
-        assets.DATA_18W17,
-        index_col=0,
-        parse_dates=["Order Date", "Ship Date"],
-        engine="pyarrow",
-    )
-
+@assets.depends_on(assets.DATA_18W17)
 @st.cache_data
 def transform_data():
-    data18w17 = load_data()
+    data18w17 = assets.cube.query(
+        assets.DATA_18W17, by=["Category"], freq="M", measures=["Sales"]
+    ).reset_index()
     return data18w17.loc[:,["Category", "Order Date", "Sales"]].groupby(
-        by="Category"
+        by="Category", observed=True
     ).resample(
         "MS", on="Order Date"
     ).sum(numeric_only=True).reset_index()
 
 # chart_type = "Jump"
+@assets.depends_on(assets.DATA_18W17)
 @st.cache_data
 def get_figure(chart_type):
     data18w17_transformed = transform_data()
@@ -1,5 +1,3 @@
-from collections import defaultdict
-
 # Plotly
 import plotly.express as px
 import plotly.graph_objects as go
@@ -16,57 +14,44 @@ import numpy as np
 # Resources
 import assets
 
+# Rollup, period column and offset prefix per granularity
+PERIODS = {
+    "Quarter": ("customer_quarters", "Order Quarter", "Q"),
+    "Month": ("customer_months", "Order Month", "M"),
+    "Week": ("customer_weeks", "Order Week", "W"),
+}
+
+def period_label(period, granularity):
+    if granularity == "Quarter":
+        return str(period).replace('Q', ' - Q')
+    if granularity == "Month":
+        return period.strftime("%b %Y")
+    return period.start_time.strftime("%Y-%m-%d")
+
+@assets.depends_on(assets.DATA_18W18)
 @st.cache_data
-def load_data():
-    return pd.read_csv(
-                assets.DATA_18W18,
-                index_col=0,
-                parse_dates=["Order Date", "Ship Date"],
-                engine="pyarrow",
-            )
-
-@st.cache_data
-def transform_data():
-    data18w18 = load_data()
-    data18w18_filtered = data18w18.loc[:, ["Order Date", "Customer ID"]].assign(
-        Order_Quarter=pd.PeriodIndex(data18w18["Order Date"], freq="Q")).sort_values(
-        by="Order Date")
-
-
-    quarters = data18w18_filtered["Order_Quarter"].unique()
-    data = []
-    first_order_customers = []
-    next_quarter_orders = defaultdict(list)
-    origin_order_customers = defaultdict(list)
-    for i, quarter in enumerate(quarters):
-        first_quarter = str(quarter).replace('Q', ' - Q')
-        filter_cond = (data18w18_filtered["Order_Quarter"]==quarter) & (~data18w18_filtered["Customer ID"].isin(first_order_customers))
-        origin = data18w18_filtered.loc[filter_cond, ["Customer ID"]]
-
-        for j in range(i, len(quarters)):
-            following_quarter = f"Q{j-i}"
-            after = data18w18_filtered.loc[data18w18_filtered["Order_Quarter"]==quarters[j], ["Customer ID"]]
-            retention = origin.merge(after, how="inner", on="Customer ID")        
-            retention_ratio = retention["Customer ID"].nunique() / origin["Customer ID"].nunique()
-
-            next_quarter_orders[j-i].extend(retention["Customer ID"].unique())
-            origin_order_customers[j-i].extend(origin["Customer ID"].unique())
-            
-            data.append({"Y": first_quarter, "X": following_quarter, "Retention": retention_ratio})
-
-        first_order_customers.extend(origin["Customer ID"].unique())
-
-    data = [{"Y": "Overall<br>Retention", 
-            "X": f"Q{i}", 
-            "Retention": len(next_quarter_orders[i]) / len(origin_order_customers[i])}
-            for i in range(0, 16)] + data
-
-    return pd.DataFrame(data)
+def transform_data(granularity="Quarter"):
+    rollup, column, prefix = PERIODS[granularity]
+    data18w18 = assets.ingest.rollup(assets.DATA_18W18, rollup)
+    retention, overall = assets.cohort.retention(data18w18, "Customer ID", column)
+
+    # Cohort by cohort, every offset up to the last period
+    n = len(retention)
+    cohorts, offsets = np.nonzero(np.add.outer(np.arange(n), np.arange(n)) < n)
+    labels = np.array([period_label(period, granularity) for period in retention.index])
+
+    return pd.DataFrame({
+        "Y": ["Overall<br>Retention"] * n + list(labels[cohorts]),
+        "X": [f"{prefix}{i}" for i in range(n)] + [f"{prefix}{i}" for i in offsets],
+        "Retention": np.r_[overall.to_numpy(), retention.to_numpy()[cohorts, offsets]],
+    })
 
 # Intermediate
+@assets.depends_on(assets.DATA_18W18)
 @st.cache_data
-def get_intermediate_figure():
-    retention_df = transform_data()
+def get_intermediate_figure(granularity="Quarter"):
+    retention_df = transform_data(granularity)
+    offsets = retention_df.loc[retention_df["Y"]=="Overall<br>Retention", "X"]
     plot_data = retention_df.query("Y!='Overall<br>Retention' and Retention!=0")
     fig = go.Figure(go.Heatmap(
         x=plot_data["X"],
@@ -74,7 +59,7 @@ def get_intermediate_figure():
         z=plot_data["Retention"],
         colorscale="BuGn",
         xgap=2, ygap=2,
-        texttemplate="%{z:.0%}",
+        texttemplate="%{z:.0%}" if len(offsets) <= 24 else None,
         hoverongaps=False,
         hoverinfo="none",
         showscale=False,
@@ -85,7 +70,7 @@ def get_intermediate_figure():
         plot_bgcolor="white",
         xaxis=dict(
             categoryorder="array",
-            categoryarray=[f"Q{i}" for i in range(0, 16)],
+            categoryarray=offsets,
             side="top", title_text="",
         ),
         yaxis=dict(
@@ -97,7 +82,7 @@ def get_intermediate_figure():
         ),
         title=dict(
             text=("<b><span style='font-size:16'>CUSTOMER RETENTION</span></b><br>"
-                "<span style='font-size:14;color:#666666'>BY COHORT AND QUARTER</span>"),
+                f"<span style='font-size:14;color:#666666'>BY COHORT AND {granularity.upper()}</span>"),
             x=0.5, xref="container", xanchor="center",
             y=0.95, yref="container", yanchor="top",
         ),
@@ -107,16 +92,18 @@ def get_intermediate_figure():
 
 
 # Jedi
+@assets.depends_on(assets.DATA_18W18)
 @st.cache_data
-def get_jedi_figure():
-    retention_df = transform_data()
+def get_jedi_figure(granularity="Quarter"):
+    retention_df = transform_data(granularity)
+    offsets = retention_df.loc[retention_df["Y"]=="Overall<br>Retention", "X"]
     fig = go.Figure(go.Heatmap(
         x=retention_df["X"],
         y=retention_df["Y"],
         z=retention_df["Retention"],
         colorscale="BuGn",
         xgap=2, ygap=2,
-        texttemplate="%{z:.0%}",
+        texttemplate="%{z:.0%}" if len(offsets) <= 24 else None,
         hoverongaps=False,
         hoverinfo="none",
         showscale=False,
@@ -127,7 +114,7 @@ def get_jedi_figure():
         plot_bgcolor="white",
         xaxis=dict(
             categoryorder="array",
-            categoryarray=[f"Q{i}" for i in range(0, 16)],
+            categoryarray=offsets,
             side="top", title_text="",
         ),
         yaxis=dict(
@@ -139,7 +126,7 @@ def get_jedi_figure():
         ),
         title=dict(
             text=("<b><span style='font-size:16'>CUSTOMER RETENTION</span></b><br>"
-                "<span style='font-size:14;color:#666666'>BY COHORT AND QUARTER</span>"),
+                f"<span style='font-size:14;color:#666666'>BY COHORT AND {granularity.upper()}</span>"),
             x=0.5, xref="container", xanchor="center",
             y=0.95, yref="container", yanchor="top",
         ),
@@ -3,25 +3,17 @@ import plotly.graph_objects as go
 
 import streamlit as st
 
-# Data manipulation
-import pandas as pd
-
 # Resources
 import assets
 
-@st.cache_data
 def load_data():
-    return pd.read_csv(
-        assets.DATA_18W19,
-        index_col=0,
-        parse_dates=["Order Date", "Ship Date"],
-        engine="pyarrow",
-    )
+    return assets.load(assets.DATA_18W19)
 
+@assets.depends_on(assets.DATA_18W19)
 @st.cache_data
 def get_customer_sales_figure():
-    data18w19 = load_data()
-    customer_sales = data18w19.loc[:, ["Customer Name", "Sales"]].groupby(
+    customer_years = assets.ingest.rollup(assets.DATA_18W19, "customer_years")
+    customer_sales = customer_years.loc[:, ["Customer Name", "Sales"]].groupby(
         by="Customer Name").sum().sort_values(by="Sales").reset_index()
 
     fig = px.bar(
@@ -48,11 +40,12 @@ def get_customer_sales_figure():
     )
     return fig
 
+@assets.depends_on(assets.DATA_18W19)
 @st.cache_data
 def get_subcategory_sales_figure():
-    data18w19 = load_data()
-    subcategory_sales = data18w19.loc[:, ["Sub-Category", "Sales"]].groupby(
-        by="Sub-Category").sum().sort_values(by="Sales").reset_index()
+    subcategory_sales = assets.cube.query(
+        assets.DATA_18W19, by=["Sub-Category"], freq=None, measures=["Sales"]
+    ).sort_values(by="Sales").reset_index()
 
     fig = px.bar(
         subcategory_sales,
@@ -78,14 +71,15 @@ def get_subcategory_sales_figure():
     )
     return fig
 
+@assets.depends_on(assets.DATA_18W19)
 @st.cache_data
 def get_state_sales_figure():
-    data18w19 = load_data()
-    usa_code = pd.read_csv(assets.DATA_MAP).loc[:, ["Code", "State"]]
-    state_sales = data18w19.loc[:, ["State", "Sales"]].groupby(
-        by="State").sum().sort_values(by="Sales").reset_index().merge(
+    usa_code = assets.load(assets.DATA_MAP).loc[:, ["Code", "State"]]
+    state_sales = assets.cube.query(
+        assets.DATA_18W19, by=["State"], freq=None, measures=["Sales"]
+    ).sort_values(by="Sales").reset_index().merge(
             usa_code, on="State", how="left"
-        )
+        ).fillna({"Code": ""})  # States without a code are not drawn
 
     fig = go.Figure(data=go.Choropleth(
         locations=state_sales["Code"],
@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from assets import basket
+
+
+@pytest.fixture
+def lines() -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    frame = pd.DataFrame({
+        "Order ID": rng.integers(0, 300, 3000).astype(str),
+        "Sub-Category": pd.Categorical(rng.integers(0, 25, 3000).astype(str)),
+        "Sales": rng.random(3000).round(2),
+    })
+    return frame.drop_duplicates(["Order ID", "Sub-Category"], ignore_index=True)
+
+
+def _matrix_pairs(lines: pd.DataFrame) -> pd.DataFrame:
+    # The A'A and V'A products pairs() stands for, computed densely
+    counts = pd.crosstab(lines["Order ID"], lines["Sub-Category"])
+    values = lines.pivot_table(
+        index="Order ID", columns="Sub-Category", values="Sales", aggfunc="sum", fill_value=0, observed=False
+    )
+    values = values.reindex(index=counts.index, columns=counts.columns)
+    frame = pd.DataFrame({
+        "count": (counts.T @ counts).stack(),
+        "value1": (values.T @ counts).stack(),
+        "value2": (counts.T @ values).stack(),
+    }).rename_axis(["item1", "item2"])
+    return frame[frame["count"] > 0]
+
+
+def _sorted(frame: pd.DataFrame) -> pd.DataFrame:
+    frame = frame.astype({"item1": str, "item2": str})
+    return frame.sort_values(by=["item1", "item2"]).set_index(["item1", "item2"])
+
+
+@pytest.mark.parametrize("chunk_pairs", [basket.CHUNK_PAIRS, 50])
+def test_pairs_is_the_matrix_product(lines, monkeypatch, chunk_pairs):
+    monkeypatch.setattr(basket, "CHUNK_PAIRS", chunk_pairs)
+    found = basket.pairs(lines, "Order ID", "Sub-Category", "Sales")
+
+    expected = _matrix_pairs(lines)
+    expected.index = expected.index.set_levels([level.astype(str) for level in expected.index.levels])
+    pd.testing.assert_frame_equal(
+        _sorted(found), expected.sort_index(), check_dtype=False, check_names=False
+    )
+
+
+@pytest.mark.parametrize("chunk_pairs", [basket.CHUNK_PAIRS, 50])
+@pytest.mark.parametrize("k, min_support", [(3, 0.0), (10, 0.02)])
+def test_top_pairs_ranks_the_partners_of_every_item(lines, monkeypatch, chunk_pairs, k, min_support):
+    monkeypatch.setattr(basket, "CHUNK_PAIRS", chunk_pairs)
+    found = basket.top_pairs(lines, "Order ID", "Sub-Category", "Sales", k=k, min_support=min_support)
+
+    # Every pair of different items, ranked by count then value, ties in item order
+    expected = basket.pairs(lines, "Order ID", "Sub-Category", "Sales")
+    expected = expected[expected["item1"] != expected["item2"]]
+    expected = expected[expected["count"] >= min_support * lines["Order ID"].nunique()]
+    expected = expected.sort_values(
+        by=["item1", "count", "value1", "item2"], ascending=[True, False, False, True], kind="stable"
+    )
+    rank = expected.groupby(by="item1", observed=True).cumcount() + 1
+    expected = expected.assign(
+        support=expected["count"] / lines["Order ID"].nunique(), rank=rank
+    )[rank <= k].reset_index(drop=True)
+
+    pd.testing.assert_frame_equal(found, expected)
+    assert found.groupby("item1", observed=True).size().max() <= k
@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from assets.cohort import retention
+
+
+def _orders(customers, quarters) -> pd.DataFrame:
+    return pd.DataFrame({
+        "Customer ID": pd.Categorical(customers),
+        "Order Quarter": pd.PeriodIndex(quarters, freq="Q"),
+    })
+
+
+def test_retention_by_first_period():
+    orders = _orders(
+        ["a", "a", "b", "b", "c"],
+        ["2017Q1", "2017Q3", "2017Q1", "2017Q2", "2017Q2"],
+    )
+    matrix, overall = retention(orders, "Customer ID", "Order Quarter")
+
+    assert list(matrix.index.astype(str)) == ["2017Q1", "2017Q2", "2017Q3"]
+    np.testing.assert_array_equal(matrix.to_numpy(), [
+        [1.0, 0.5, 0.5],
+        [1.0, 0.0, np.nan],
+        [np.nan, np.nan, np.nan],
+    ])
+    # Weighted by cohort size: one of the three customers ordered again a
+    # quarter after their first order
+    assert overall.tolist() == pytest.approx([1.0, 1 / 3, 0.5])
+
+
+@pytest.mark.parametrize("missing", [None, np.nan])
+def test_rows_without_a_customer_belong_to_no_cohort(missing):
+    orders = _orders(["a", "b", "b"], ["2017Q2", "2017Q2", "2017Q3"])
+    with_missing = pd.concat([
+        orders,
+        _orders([missing], ["2017Q1"]).astype({"Customer ID": orders["Customer ID"].dtype}),
+    ], ignore_index=True)
+
+    expected = retention(orders, "Customer ID", "Order Quarter")
+    for frame in (with_missing, with_missing.astype({"Customer ID": object})):
+        matrix, overall = retention(frame, "Customer ID", "Order Quarter")
+        pd.testing.assert_frame_equal(matrix, expected[0])
+        pd.testing.assert_series_equal(overall, expected[1])
@@ -0,0 +1,113 @@
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+import assets
+from assets import datasets
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(datasets, "CACHE_DIR", tmp_path)
+    datasets.clear()
+    yield tmp_path
+    datasets.clear()
+
+
+def _load(monkeypatch, arrow_mmap: bool) -> pd.DataFrame:
+    monkeypatch.setattr(datasets, "ARROW_MMAP", arrow_mmap)
+    # The first load parses the CSV and writes the cache, the second reads it
+    datasets.clear()
+    assets.load(assets.DATA_18W02_SAMPLE)
+    datasets.clear()
+    return assets.load(assets.DATA_18W02_SAMPLE)
+
+
+def test_cache_modes_load_the_same_data(cache_dir, monkeypatch):
+    parsed = datasets._read_csv(assets.DATA_18W02_SAMPLE.resolve())
+    parquet = _load(monkeypatch, arrow_mmap=False)
+    mapped = _load(monkeypatch, arrow_mmap=True)
+
+    assert list(cache_dir.glob("*.parquet")) and list(cache_dir.glob("*.arrow"))
+    pd.testing.assert_series_equal(parquet.dtypes, parsed.dtypes)
+    # Only the strings differ, kept as Arrow arrays on the mapping
+    strings = parsed.dtypes == object
+    assert (mapped.dtypes[strings] == pd.ArrowDtype(pa.string())).all()
+    pd.testing.assert_series_equal(mapped.dtypes[~strings], parsed.dtypes[~strings])
+    pd.testing.assert_frame_equal(mapped.astype(parsed.dtypes.to_dict()), parquet)
+
+
+def _new_orders(path) -> pd.DataFrame:
+    # The last order line again, a year after the end of the data set
+    orders = pd.read_csv(path, encoding="utf-8-sig").tail(1)
+    return orders.assign(**{"Order Date": "2018-06-30", "Sales": 100.0})
+
+
+def test_derived_drops_results_computed_before_an_append(cache_dir):
+    path = assets.DATA_18W02_SAMPLE
+    calls = []
+
+    @datasets.derived
+    def last_date(path):
+        dates = datasets.load(path)["Order Date"]
+        if not calls:
+            # Another session appends while this one is still computing
+            datasets.append(path, _new_orders(path))
+        calls.append(dates.max())
+        return dates.max()
+
+    assert last_date(path) < pd.Timestamp("2018-06-30")
+    assert last_date(path) == pd.Timestamp("2018-06-30")
+    assert last_date(path) == pd.Timestamp("2018-06-30")
+    assert len(calls) == 2
+
+
+def test_appended_orders_update_the_built_rollups(cache_dir):
+    path = assets.DATA_18W02_SAMPLE
+    before = assets.ingest.rollup(path, "customer_years")["Sales"].sum()
+    assets.ingest.append(path, _new_orders(path))
+    after = assets.ingest.rollup(path, "customer_years")
+
+    assert after["Sales"].sum() == pytest.approx(before + 100.0)
+    assert 2018 in after["Order Year"].to_numpy()
+
+
+def test_merged_rollups_match_rollups_built_after_the_appends(cache_dir):
+    path = assets.DATA_18W02_SAMPLE
+    lines = pd.read_csv(path, encoding="utf-8-sig")
+    # New orders after the last date and within the data set, with new products
+    batches = [
+        lines.sample(40, random_state=seed).assign(**{"Order Date": date})
+        for seed, date in enumerate(["2018-01-02", "2016-05-05", "2018-01-02"])
+    ]
+    batches[0] = batches[0].assign(**{"Product ID": "NEW-10000001", "Product Name": "A new product"})
+
+    for name in assets.ingest.ROLLUPS:
+        assets.ingest.rollup(path, name)
+    base = datasets._FRAMES[path.resolve()]
+    for orders in batches:
+        assets.ingest.append(path, orders)
+    merged = {name: assets.ingest.rollup(path, name) for name in assets.ingest.ROLLUPS}
+    loaded = assets.load(path)
+
+    # Appending leaves the frame read from the file alone
+    assert datasets._FRAMES[path.resolve()] is base
+    assert loaded["Order Date"].is_monotonic_increasing
+    assert len(loaded) == len(base) + 120
+
+    datasets.clear()
+    for orders in batches:
+        datasets.append(path, orders)
+    for name in assets.ingest.ROLLUPS:
+        pd.testing.assert_frame_equal(merged[name], assets.ingest.rollup(path, name), obj=name)
+    pd.testing.assert_frame_equal(loaded, assets.load(path))
+
+
+def test_registered_exports_are_typed_whatever_their_name(cache_dir, tmp_path):
+    export = tmp_path / "superstore-export.csv"
+    export.write_bytes(assets.DATA_18W02_SAMPLE.read_bytes())
+    datasets.register(export, "superstore")
+
+    pd.testing.assert_frame_equal(assets.load(export), assets.load(assets.DATA_18W02_SAMPLE))
+    with pytest.raises(ValueError, match="Unknown schema"):
+        datasets.register(export, "superstores")
@@ -0,0 +1,40 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from assets import fiscal
+
+MONTHS = ["JAN", "FEB", "MAR", "APR", "MAY", "JUN", "JUL", "AUG", "SEP", "OCT", "NOV", "DEC"]
+DATES = pd.to_datetime(["2016-02-29", "2016-03-31", "2016-04-01", "2016-12-31", "2017-01-01", "2017-03-15"])
+
+
+@pytest.mark.parametrize("start_month", fiscal.START_MONTHS)
+def test_calendar_matches_pandas_fiscal_years(start_month):
+    # A pandas fiscal year ending the month before `start_month`, named
+    # after the year it starts in
+    starts = DATES.to_period(f"Y-{MONTHS[start_month - 2]}").start_time
+
+    np.testing.assert_array_equal(fiscal.year_start(DATES, start_month), starts.to_numpy("datetime64[D]"))
+    np.testing.assert_array_equal(fiscal.fiscal_year(DATES, start_month), starts.year)
+    np.testing.assert_array_equal(fiscal.day_of_year(DATES, start_month), (DATES - starts).days)
+
+
+@pytest.mark.parametrize("start_month", [1, 3, 4])
+def test_aligned_keeps_month_and_day(start_month):
+    aligned = pd.DatetimeIndex(fiscal.aligned(DATES, start_month))
+
+    np.testing.assert_array_equal(aligned.month, DATES.month)
+    np.testing.assert_array_equal(aligned.day, DATES.day)
+    # Every fiscal year is laid on the same one
+    assert (fiscal.fiscal_year(aligned, start_month) == fiscal.fiscal_year(aligned[:1], start_month)).all()
+
+
+def test_running_totals_restart_every_fiscal_year():
+    values = np.arange(1.0, len(DATES) + 1)
+    totals = fiscal.running_totals(DATES, values)
+
+    assert list(totals.columns) == list(fiscal.START_MONTHS)
+    for start_month in fiscal.START_MONTHS:
+        years = fiscal.fiscal_year(DATES, start_month)
+        expected = pd.Series(values).groupby(years).cumsum()
+        np.testing.assert_allclose(totals[start_month], expected)
@@ -0,0 +1,43 @@
+import pandas as pd
+import pytest
+
+import assets
+from assets import hierarchy
+
+LEVELS = ["Category", "Sub-Category", "Product Name"]
+
+
+@pytest.fixture(scope="module")
+def orders() -> pd.DataFrame:
+    return assets.load(assets.DATA_18W02_SAMPLE)
+
+
+@pytest.fixture(scope="module")
+def sums(orders) -> list[pd.Series]:
+    return hierarchy.totals(orders, LEVELS, "Sales")
+
+
+def test_totals_match_a_group_by_per_depth(orders, sums):
+    assert len(sums) == len(LEVELS)
+    for depth, level_sums in enumerate(sums):
+        expected = orders.groupby(by=LEVELS[:depth + 1], observed=True)["Sales"].sum()
+        pd.testing.assert_series_equal(level_sums, expected, check_index_type=False)
+
+
+def test_annotate_puts_every_ancestor_total_next_to_the_leaves(orders, sums):
+    leaves = hierarchy.annotate(sums)
+
+    assert list(leaves.columns) == ["Sales", "level0_sum", "level1_sum"]
+    for depth, column in enumerate(["level0_sum", "level1_sum"]):
+        expected = orders.groupby(by=LEVELS, observed=True)["Sales"].sum().groupby(
+            level=list(range(depth + 1)), observed=True
+        ).transform("sum")
+        pd.testing.assert_series_equal(leaves[column], expected, check_names=False)
+
+
+def test_children_drill_down(sums):
+    pd.testing.assert_series_equal(hierarchy.children(sums), sums[0])
+    furniture = hierarchy.children(sums, "Furniture")
+    assert furniture.index.name == "Sub-Category"
+    assert furniture.sum() == pytest.approx(sums[0]["Furniture"])
+    assert hierarchy.children(sums, "Furniture", "Chairs").sum() == pytest.approx(furniture["Chairs"])